@@ -0,0 +1,284 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+from sh_gen import ALLOCATION_STRATEGIES, DEFAULT_STRATEGY, ScheduleGenerator
+
+PROFILE_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+
+class BatchStats:
+    """Running totals for a batch run"""
+
+    def __init__(self):
+        self.profiles = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, failed):
+        self.profiles += 1
+        if failed:
+            self.errors += 1
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def profiles_per_sec(self):
+        return self.profiles / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"{self.profiles} profiles ({self.errors} failed) in {self.elapsed:.2f}s "
+                f"- {self.profiles_per_sec:.1f} profiles/sec")
+
+
+def iter_profile_sources(source):
+    """Yield (profile_id, text, fmt) for every profile in a directory, a JSONL file, or '-' for stdin"""
+    if source != '-' and os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() not in PROFILE_EXTENSIONS:
+                continue
+            with open(os.path.join(source, name), encoding='utf-8') as f:
+                yield stem, f.read(), 'json' if ext.lower() == '.json' else 'yaml'
+        return
+
+    stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        for line_number, line in enumerate(stream, 1):
+            if line.strip():
+                yield f"line {line_number}", line, 'json'
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def parse_profile(text, fmt):
+    """Parse a profile, accepting either bare user_data or a file written by save_schedule"""
+    if fmt == 'json':
+        data = json.loads(text)
+    else:
+        import yaml
+        data = yaml.safe_load(text)
+    if not isinstance(data, dict):
+        raise ValueError("Profile must be a mapping of user_data fields")
+    return data.get('user_data', data)
+
+
+def process_profile(profile_id, text, fmt, scheduler=None, precheck=False, cache=None, conflicts=False,
+                    pending=None):
+    """Generate one schedule and return its result record; failures are returned, not raised.
+
+    With precheck, profiles the feasibility check rejects get an error record
+    without running allocation. With a sh_cache.ResultCache, profiles seen
+    before are answered from it. With conflicts, the record also lists every
+    pair of overlapping fixed entries. With pending (a list), a generated
+    record is queued there for add_occupancy, which caches it once finished.
+    """
+    scheduler = scheduler or ScheduleGenerator()
+    key = None
+    try:
+        user_data = parse_profile(text, fmt)
+        if cache is not None:
+            from sh_cache import canonical_key
+            extra = (scheduler.strategy, conflicts) + (('occupancy',) if pending is not None else ())
+            key = canonical_key(user_data, *extra)
+            cached = cache.get(key)
+            if cached is not None:
+                return {'id': profile_id, **cached}
+        scheduler.load_user_data(user_data)
+        if precheck:
+            report = scheduler.check_feasibility()
+            if not report.feasible:
+                return {'id': profile_id, 'error': f"Infeasible: {'; '.join(report.errors)}"}
+        scheduler.run_pipeline()
+    except KeyError as e:
+        return {'id': profile_id, 'error': f"Missing field {e}"}
+    except Exception as e:
+        return {'id': profile_id, 'error': f"{type(e).__name__}: {e}"}
+    result = scheduler.to_dict()
+    if conflicts:
+        result['conflicts'] = [conflict.describe() for conflict in scheduler.find_conflicts()]
+    record = {'id': profile_id, **result}
+    if pending is not None:
+        pending.append((record, result, key, scheduler.schedule, scheduler.user_data))
+    elif cache is not None:
+        cache.put(key, result)
+    return record
+
+
+def add_occupancy(pending, days, cache=None):
+    """Give each record process_profile queued in pending its per-day busy minutes, double-booked
+    minutes and waking-time utilization, from one sh_occupancy.BatchOccupancy of all their schedules"""
+    if not pending:
+        return
+    from sh_occupancy import BatchOccupancy
+    occupancy = BatchOccupancy.from_schedules([row[3] for row in pending], [row[4] for row in pending],
+                                              days, types=None)
+    busy = occupancy.busy_minutes().tolist()
+    overlap = occupancy.overlap_minutes().tolist()
+    utilization = occupancy.utilization().round(4).tolist()
+    for i, (record, result, key, _, _) in enumerate(pending):
+        record['occupancy'] = result['occupancy'] = {
+            'busy_minutes': busy[i], 'overlap_minutes': overlap[i], 'utilization': utilization[i]}
+        if key is not None:
+            cache.put(key, result)
+    pending.clear()
+
+
+def format_result(result):
+    """Serialize a result record as one JSON line"""
+    return json.dumps(result, separators=(',', ':')) + '\n'
+
+
+def make_caches(scheduler, cache_dir=None):
+    """Give scheduler a fixed-layout cache and return the result cache to use beside it"""
+    from sh_cache import FixedLayoutCache, ResultCache
+    scheduler.layout_cache = FixedLayoutCache()
+    return ResultCache(directory=cache_dir)
+
+
+def _process_profiles(profiles, scheduler, precheck, cache, conflicts, occupancy):
+    """(json_line, failed) for each profile, adding occupancy to the generated ones when asked"""
+    pending = [] if occupancy else None
+    records = [process_profile(profile_id, text, fmt, scheduler, precheck, cache, conflicts, pending)
+               for profile_id, text, fmt in profiles]
+    if occupancy:
+        add_occupancy(pending, scheduler.days, cache)
+    return [(format_result(record), 'error' in record) for record in records]
+
+
+def run_batch(source, out, strategy=DEFAULT_STRATEGY, precheck=False, cache=False, cache_dir=None, conflicts=False,
+              occupancy=False, chunk_size=32):
+    """Generate a schedule for every profile in source, streaming one JSON line per profile to out.
+
+    With occupancy, profiles are generated chunk_size at a time so each
+    chunk's occupancy is computed in one NumPy batch.
+    """
+    stats = BatchStats()
+    scheduler = ScheduleGenerator(strategy)
+    results = make_caches(scheduler, cache_dir) if cache else None
+    for chunk in _chunked(iter_profile_sources(source), chunk_size if occupancy else 1):
+        for line, failed in _process_profiles(chunk, scheduler, precheck, results, conflicts, occupancy):
+            out.write(line)
+            stats.record(failed)
+    return stats
+
+
+# Each worker process keeps one generator and reuses it for every profile it is sent
+_worker_scheduler = None
+_worker_precheck = False
+_worker_results = None
+_worker_conflicts = False
+_worker_occupancy = False
+
+
+def _init_worker(strategy, precheck=False, cache=False, cache_dir=None, conflicts=False, instrument=False,
+                 occupancy=False):
+    global _worker_scheduler, _worker_precheck, _worker_results, _worker_conflicts, _worker_occupancy
+    _worker_scheduler = ScheduleGenerator(strategy, instrument=instrument)
+    _worker_precheck = precheck
+    _worker_results = make_caches(_worker_scheduler, cache_dir) if cache else None
+    _worker_conflicts = conflicts
+    _worker_occupancy = occupancy
+
+
+def _process_chunk(chunk):
+    """Worker side: generate a chunk of profiles and return (json_line, failed) pairs"""
+    return _process_profiles(chunk, _worker_scheduler, _worker_precheck, _worker_results, _worker_conflicts,
+                             _worker_occupancy)
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(task, items, workers=None, chunk_size=32, initargs=()):
+    """Run task over chunks of items in a process pool, yielding (chunk, result, error) in input order.
+
+    Workers are set up by _init_worker(*initargs). At most two chunks per
+    worker are in flight, so memory stays bounded however large the input is.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+
+    def drain_one():
+        chunk, future = pending.popleft()
+        try:
+            return chunk, future.result(), None
+        except Exception as e:
+            return chunk, None, e
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        for chunk in _chunked(items, chunk_size):
+            pending.append((chunk, pool.submit(task, chunk)))
+            if len(pending) >= workers * 2:
+                yield drain_one()
+        while pending:
+            yield drain_one()
+
+
+def run_batch_parallel(source, out, workers=None, chunk_size=32, strategy=DEFAULT_STRATEGY, precheck=False,
+                       cache=False, cache_dir=None, conflicts=False, occupancy=False):
+    """Like run_batch, but spreads chunks of profiles over a process pool, writing results in input order"""
+    stats = BatchStats()
+    chunks = map_chunks(_process_chunk, iter_profile_sources(source), workers, chunk_size,
+                        (strategy, precheck, cache, cache_dir, conflicts, False, occupancy))
+    for chunk, lines, error in chunks:
+        if error is not None:
+            # A chunk that could not run at all still gets one error record per profile
+            lines = [(format_result({'id': profile_id, 'error': f"{type(error).__name__}: {error}"}), True)
+                     for profile_id, _, _ in chunk]
+        for line, failed in lines:
+            out.write(line)
+            stats.record(failed)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate schedules for many user_data profiles")
+    parser.add_argument('source', help="directory of .json/.yaml profiles, a JSONL file, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL output file (default: stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="worker processes; 0 uses every core (default: 1, no pool)")
+    parser.add_argument('--chunk-size', type=int, default=32, help="profiles per worker task or occupancy batch")
+    parser.add_argument('--strategy', default=DEFAULT_STRATEGY, choices=['greedy', *ALLOCATION_STRATEGIES],
+                        help="learning-goal allocation strategy")
+    parser.add_argument('--precheck', action='store_true',
+                        help="reject infeasible profiles before allocating their time")
+    parser.add_argument('--cache', action='store_true',
+                        help="reuse results for repeated profiles and layouts for repeated timetables")
+    parser.add_argument('--cache-dir', help="also keep cached results in this directory (implies --cache)")
+    parser.add_argument('--conflicts', action='store_true',
+                        help="list overlapping fixed entries in each result")
+    parser.add_argument('--occupancy', action='store_true',
+                        help="add per-day busy minutes, overlaps and utilization to each result (requires NumPy)")
+    args = parser.parse_args(argv)
+
+    cache = args.cache or args.cache_dir is not None
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        if args.workers == 1:
+            stats = run_batch(args.source, out, args.strategy, args.precheck, cache, args.cache_dir,
+                              args.conflicts, args.occupancy, args.chunk_size)
+        else:
+            stats = run_batch_parallel(args.source, out, args.workers or None, args.chunk_size, args.strategy,
+                                       args.precheck, cache, args.cache_dir, args.conflicts, args.occupancy)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(stats.summary(), file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
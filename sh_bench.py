@@ -0,0 +1,165 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from sh_gen import ALLOCATION_STRATEGIES, DEFAULT_STRATEGY, ScheduleGenerator
+from sh_time import format_time
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Stages timed for every case, in the order they run
+STAGES = ('add_fixed_commitments', 'schedule_learning_goals', 'fill_gaps', 'save_schedule')
+
+
+def synthetic_profile(seed, n_classes=10, n_goals=5, min_session=0.5, max_session=2.0, days_per_class=3):
+    """Build a reproducible user_data profile of the requested size"""
+    rng = random.Random(seed)
+    fixed_classes = []
+    for i in range(n_classes):
+        start = rng.randrange(8 * 60, 21 * 60, 5)
+        end = min(start + rng.randrange(15, 120, 5), 22 * 60)
+        fixed_classes.append({
+            'name': f"Class {i}",
+            'days': rng.sample(DAYS, min(days_per_class, 7)),
+            'start_time': format_time(start),
+            'end_time': format_time(end),
+            'prep_time': rng.choice([0, 0, 0.25, 0.5]),
+            'post_time': rng.choice([0, 0, 0.25]),
+        })
+    learning_goals = [{
+        'name': f"Goal {i}",
+        'weekly_hours': rng.choice([1, 2, 4, 6, 10]),
+        'priority': rng.randint(1, 10),
+        'preferred_time': rng.choice(['morning', 'afternoon', 'evening', 'anytime']),
+        'min_session': min_session,
+        'max_session': max_session,
+    } for i in range(n_goals)]
+    return {
+        'sleep_duration': rng.choice([7, 7.5, 8]),
+        'wake_up_time': rng.choice(['06:00', '06:30', '07:00', '07:30']),
+        'cook_dinner': rng.random() < 0.5,
+        'cooking_time': 1,
+        'fixed_classes': fixed_classes,
+        'learning_goals': learning_goals,
+        'entertainment_hours': rng.choice([5, 10, 14]),
+    }
+
+
+def time_stages(user_data, strategy=DEFAULT_STRATEGY, repeat=3):
+    """Run the pipeline repeat times; return the best milliseconds per stage and entries per day"""
+    best = {stage: None for stage in STAGES}
+    entries = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'schedule.yaml')
+        for _ in range(repeat):
+            scheduler = ScheduleGenerator(strategy)
+            scheduler.load_user_data(user_data)
+            for stage in STAGES:
+                start = time.perf_counter()
+                if stage == 'save_schedule':
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        scheduler.save_schedule(filename)
+                else:
+                    getattr(scheduler, stage)()
+                elapsed = (time.perf_counter() - start) * 1000
+                if best[stage] is None or elapsed < best[stage]:
+                    best[stage] = elapsed
+            entries = sum(len(items) for items in scheduler.schedule.values())
+    return {stage: round(ms, 4) for stage, ms in best.items()}, entries / len(DAYS)
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(sizes, n_goals=5, min_session=0.5, max_session=2.0, days_per_class=3,
+              seed=0, repeat=3, strategy=DEFAULT_STRATEGY):
+    """Benchmark one case per class count in sizes and return a JSON-ready report"""
+    cases = []
+    for n_classes in sizes:
+        profile = synthetic_profile(seed, n_classes, n_goals, min_session, max_session, days_per_class)
+        stages, entries_per_day = time_stages(profile, strategy, repeat)
+        cases.append({
+            'fixed_classes': n_classes,
+            'learning_goals': n_goals,
+            'entries_per_day': round(entries_per_day, 2),
+            'stages_ms': stages,
+            'total_ms': round(sum(stages.values()), 4),
+        })
+    return {
+        'meta': {
+            'commit': _commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'strategy': strategy,
+            'min_session': min_session,
+            'max_session': max_session,
+            'days_per_class': days_per_class,
+        },
+        'cases': cases,
+        # entries/day vs. total milliseconds, ready to plot
+        'scaling': [[case['entries_per_day'], case['total_ms']] for case in cases],
+    }
+
+
+def compare(report, baseline):
+    """Per-stage time ratios (current / baseline) for cases present in both reports"""
+    previous = {case['fixed_classes']: case for case in baseline['cases']}
+    lines = []
+    for case in report['cases']:
+        old = previous.get(case['fixed_classes'])
+        if old is None:
+            continue
+        ratios = ', '.join(f"{stage} x{case['stages_ms'][stage] / old['stages_ms'][stage]:.2f}"
+                           for stage in STAGES if old['stages_ms'].get(stage))
+        lines.append(f"{case['fixed_classes']} classes: {ratios}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the schedule generation pipeline")
+    parser.add_argument('--sizes', default='5,20,50,100,200,400',
+                        help="comma-separated numbers of fixed classes, one case each")
+    parser.add_argument('--goals', type=int, default=5, help="learning goals per profile")
+    parser.add_argument('--min-session', type=float, default=0.5)
+    parser.add_argument('--max-session', type=float, default=2.0)
+    parser.add_argument('--days', type=int, default=3, help="days each class repeats on")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case; the fastest is kept")
+    parser.add_argument('--strategy', default=DEFAULT_STRATEGY, choices=['greedy', *ALLOCATION_STRATEGIES])
+    parser.add_argument('-o', '--output', default='-', help="JSON report file (default: stdout)")
+    parser.add_argument('--compare', help="earlier JSON report to print per-stage ratios against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    report = run_suite(sizes, args.goals, args.min_session, args.max_session, args.days,
+                       args.seed, args.repeat, args.strategy)
+
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print(compare(report, json.load(f)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+from sh_gen import ScheduleEntry
+
+def canonical_key(data, *extra):
+    """SHA-256 of data as canonical JSON, so equal profiles hash alike whatever their key order"""
+    text = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha256()
+    for part in extra:
+        digest.update(f"{part}\n".encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def layout_key(user_data):
+    """Everything add_fixed_commitments reads, as a hashable tuple; other class fields are ignored"""
+    return (user_data['sleep_duration'], user_data['wake_up_time'], user_data['cook_dinner'],
+            user_data['cooking_time'],
+            tuple((class_info['name'], tuple(class_info['days']), class_info['start_time'],
+                   class_info['end_time'], class_info['prep_time'], class_info['post_time'])
+                  for class_info in user_data['fixed_classes']))
+
+
+class ResultCache:
+    """LRU cache of generated results with an optional on-disk tier.
+
+    Memory holds up to max_entries values. With a directory, every value is
+    also written as JSON to <directory>/<key[:2]>/<key>.json, and memory
+    misses fall back to disk, so results outlive the process. Values are
+    JSON-serialisable, or with encoded already UTF-8 JSON bytes stored as is.
+    """
+
+    def __init__(self, max_entries=1024, directory=None, encoded=False):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.encoded = encoded
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key, default=None):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+        if self.directory is not None:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    value = f.read()
+                if not self.encoded:
+                    value = json.loads(value)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.directory is not None:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value if self.encoded else json.dumps(value, separators=(',', ':')).encode('utf-8'))
+            os.replace(tmp, path)
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.entries or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class FixedLayoutCache:
+    """LRU cache of the add_fixed_commitments stage, keyed on sleep, wake, cooking and fixed_classes.
+
+    Profiles sharing a timetable but not goals reuse the fixed entries and
+    each day's free-slot index instead of laying them out again. Set it as a
+    ScheduleGenerator's layout_cache to use it.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        # key -> {day: (entry tuples, free-slot index)}
+        self.layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(user_data):
+        return layout_key(user_data)
+
+    def restore(self, scheduler, key):
+        """Install the layout cached under key into a scheduler with an empty schedule; False on a miss"""
+        layout = self.layouts.get(key)
+        if layout is None:
+            self.misses += 1
+            return False
+        self.layouts.move_to_end(key)
+        self.hits += 1
+        classes = scheduler.user_data['fixed_classes']
+        for day, (rows, _) in layout.items():
+            scheduler.schedule[day] = [
+                ScheduleEntry(task, start, end, entry_type, None if source is None else classes[source])
+                for task, start, end, entry_type, source in rows]
+        # Indexes also cover time spilling over from the neighbouring days, so install them once all days are in
+        for day, (_, free_index) in layout.items():
+            lists = scheduler._neighbour_lists(day)
+            scheduler._slot_indexes[day] = (free_index.copy(), lists, tuple(len(entries) for entries in lists))
+        return True
+
+    def store(self, scheduler, key):
+        """Remember the fixed layout a scheduler just built under key"""
+        positions = {id(class_info): i for i, class_info in enumerate(scheduler.user_data['fixed_classes'])}
+        layout = {}
+        for day in scheduler.days:
+            index = scheduler.get_slot_index(day)
+            rows = tuple((item.task, item.start_min, item.end_min, item.type, positions.get(id(item.source)))
+                         for item in scheduler.schedule[day])
+            layout[day] = (rows, index.copy())
+        self.layouts[key] = layout
+        while len(self.layouts) > self.max_entries:
+            self.layouts.popitem(last=False)
+
@@ -0,0 +1,186 @@
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from sh_gen import DEFAULT_STRATEGY, ScheduleGenerator
+
+
+def parse_date(value):
+    """Accept a datetime.date or an ISO "YYYY-MM-DD" string"""
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value.strip())
+
+
+def _entry_key(item):
+    return (item.start_min, item.end_min, item.task, item.type)
+
+
+def _same_day(a, b):
+    """Entries equal regardless of the order stages appended them in"""
+    return len(a) == len(b) and sorted(map(_entry_key, a)) == sorted(map(_entry_key, b))
+
+
+class DateRangeSchedule:
+    """A schedule over a date range, stored as repeating week templates plus per-date deltas
+
+    fixed_classes may carry optional 'start_date' and 'end_date' (inclusive,
+    ISO strings); a class only occurs on its days within that range. Each
+    exception is a dict with a 'date' and optionally 'cancel' (class names
+    dropped that day) and 'add' (one-off class dicts without 'days', whose
+    prep_time and post_time default to 0).
+
+    Weeks with the same set of active classes share one generated week, so
+    templates and deltas grow with the number of class boundaries and
+    exceptions rather than with the length of the range.
+    """
+
+    def __init__(self, user_data, start_date, end_date, exceptions=(), strategy=DEFAULT_STRATEGY, time_budget=1.0):
+        self.start_date = parse_date(start_date)
+        self.end_date = parse_date(end_date)
+        if self.end_date < self.start_date:
+            raise ValueError(f"End date {self.end_date} is before start date {self.start_date}")
+        self.user_data = user_data
+        self.exceptions = [dict(item, date=parse_date(item['date'])) for item in exceptions]
+        for exception in self.exceptions:
+            for class_info in exception.get('add', ()):
+                missing = [key for key in ('name', 'start_time', 'end_time') if key not in class_info]
+                if missing:
+                    raise ValueError(f"Class added on {exception['date']} is missing {', '.join(missing)}")
+        self.strategy = strategy
+        self.time_budget = time_budget
+        # Monday of the first week; week n covers first_monday + 7n .. +6
+        self.first_monday = self.start_date - timedelta(days=self.start_date.weekday())
+        self.week_count = self._week_of(self.end_date) + 1
+        # key -> generated week shared by every week with that set of active class days
+        self.templates = {}
+        # Parallel lists: first week index of each run of identical weeks, and its template key
+        self.run_starts = []
+        self.run_keys = []
+        # date -> entries for the dates an exception actually changed
+        self.deltas = {}
+        self.days = ScheduleGenerator().days
+
+    def _week_of(self, day):
+        return (day - self.first_monday).days // 7
+
+    def _monday(self, week):
+        return self.first_monday + timedelta(weeks=week)
+
+    def _week_key(self, week):
+        """Per class, the weekdays it is active on in this week"""
+        monday = self._monday(week)
+        key = []
+        for class_info in self.user_data.get('fixed_classes', []):
+            first = parse_date(class_info['start_date']) if class_info.get('start_date') else None
+            last = parse_date(class_info['end_date']) if class_info.get('end_date') else None
+            active = []
+            for day in class_info['days']:
+                if day not in self.days:
+                    continue
+                when = monday + timedelta(days=self.days.index(day))
+                if (first is None or when >= first) and (last is None or when <= last):
+                    active.append(day)
+            key.append(tuple(active))
+        return tuple(key)
+
+    def _week_user_data(self, key):
+        user_data = dict(self.user_data)
+        user_data['fixed_classes'] = [dict(class_info, days=list(days)) for class_info, days
+                                      in zip(self.user_data.get('fixed_classes', []), key)]
+        return user_data
+
+    def _template(self, key):
+        scheduler = self.templates.get(key)
+        if scheduler is None:
+            if self.templates:
+                # Variants differ by a few class days; derive them incrementally
+                scheduler = next(iter(self.templates.values())).copy()
+                scheduler.apply_user_data(self._week_user_data(key))
+            else:
+                scheduler = ScheduleGenerator(self.strategy, self.time_budget)
+                scheduler.load_user_data(self._week_user_data(key))
+                scheduler.run_pipeline()
+            self.templates[key] = scheduler
+        return scheduler
+
+    def _boundary_weeks(self):
+        """Weeks whose class set can differ from the week before"""
+        weeks = {0}
+        for class_info in self.user_data.get('fixed_classes', []):
+            for field, shift in (('start_date', 0), ('end_date', 1)):
+                if class_info.get(field):
+                    week = self._week_of(parse_date(class_info[field]) + timedelta(days=shift))
+                    weeks.update((week, week + 1))
+        return sorted(week for week in weeks if 0 <= week < self.week_count)
+
+    def generate(self):
+        """Build the week templates and the deltas for every exception date"""
+        self.templates, self.run_starts, self.run_keys, self.deltas = {}, [], [], {}
+        for week in self._boundary_weeks():
+            key = self._week_key(week)
+            if not self.run_keys or self.run_keys[-1] != key:
+                self.run_starts.append(week)
+                self.run_keys.append(key)
+                self._template(key)
+
+        by_week = {}
+        for exception in self.exceptions:
+            if self.start_date <= exception['date'] <= self.end_date:
+                by_week.setdefault(self._week_of(exception['date']), []).append(exception)
+        for week, exceptions in sorted(by_week.items()):
+            self._apply_exceptions(week, exceptions)
+        return self
+
+    def _apply_exceptions(self, week, exceptions):
+        template = self.week_template(week)
+        user_data = dict(template.user_data)
+        classes = [dict(class_info) for class_info in template.user_data['fixed_classes']]
+        for exception in exceptions:
+            day = self.days[exception['date'].weekday()]
+            cancelled = set(exception.get('cancel', ()))
+            for class_info in classes:
+                if class_info['name'] in cancelled:
+                    class_info['days'] = [item for item in class_info['days'] if item != day]
+            for class_info in exception.get('add', ()):
+                classes.append({'prep_time': 0, 'post_time': 0, **class_info, 'days': [day]})
+        user_data['fixed_classes'] = classes
+
+        scheduler = template.copy()
+        scheduler.apply_user_data(user_data)
+        monday = self._monday(week)
+        for offset, day in enumerate(self.days):
+            when = monday + timedelta(days=offset)
+            if self.start_date <= when <= self.end_date and \
+                    not _same_day(scheduler.schedule[day], template.schedule[day]):
+                self.deltas[when] = scheduler.schedule[day]
+
+    def week_template(self, week):
+        """The shared generator for week index week"""
+        run = bisect_right(self.run_starts, week) - 1
+        if run < 0:
+            raise ValueError(f"Week {week} is outside the generated range")
+        return self.templates[self.run_keys[run]]
+
+    def entries_for(self, day):
+        """Schedule entries for one date"""
+        day = parse_date(day)
+        if not self.start_date <= day <= self.end_date:
+            raise ValueError(f"{day} is outside {self.start_date} - {self.end_date}")
+        delta = self.deltas.get(day)
+        if delta is not None:
+            return delta
+        return self.week_template(self._week_of(day)).schedule[self.days[day.weekday()]]
+
+    def __iter__(self):
+        """Yield (date, entries) for every date in the range, in order"""
+        day = self.start_date
+        while day <= self.end_date:
+            yield day, self.entries_for(day)
+            day += timedelta(days=1)
+
+    def __len__(self):
+        return (self.end_date - self.start_date).days + 1
+
+    def to_dict(self):
+        """Materialized {ISO date: [entry dicts]} for the whole range"""
+        return {day.isoformat(): [item.to_dict() for item in entries] for day, entries in self}
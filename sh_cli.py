@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+import sh_batch
+import sh_io
+from sh_batch import PROFILE_EXTENSIONS, parse_profile
+from sh_gen import ALLOCATION_STRATEGIES, DEFAULT_STRATEGY, ScheduleGenerator, ScheduleStats
+
+
+def iter_profiles(paths):
+    """Yield (name, text, fmt) for profile files, directories of them, or '-' for stdin"""
+    for path in paths:
+        if path == '-':
+            text = sys.stdin.read()
+            yield 'stdin', text, 'json' if text.lstrip().startswith('{') else 'yaml'
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if os.path.splitext(name)[1].lower() in PROFILE_EXTENSIONS:
+                    yield from iter_profiles([os.path.join(path, name)])
+        else:
+            stem, ext = os.path.splitext(os.path.basename(path))
+            with open(path, encoding='utf-8') as f:
+                yield stem, f.read(), 'json' if ext.lower() == '.json' else 'yaml'
+
+
+def generate_file(name, text, fmt, scheduler, output_dir, output_format):
+    """Generate and save one profile with scheduler; returns a result dict (errors are returned, not raised)"""
+    start = time.perf_counter()
+    if scheduler.stats is not None:
+        scheduler.stats = ScheduleStats()
+    try:
+        scheduler.load_user_data(parse_profile(text, fmt))
+        scheduler.run_pipeline()
+        filename = os.path.join(output_dir, f"{name}_schedule{sh_io.FORMATS[output_format][0]}")
+        sh_io.save(scheduler, filename, output_format)
+    except KeyError as e:
+        return {'name': name, 'error': f"Missing field {e}"}
+    except Exception as e:
+        return {'name': name, 'error': f"{type(e).__name__}: {e}"}
+    return {
+        'name': name,
+        'filename': filename,
+        'entries': sum(len(items) for items in scheduler.schedule.values()),
+        'ms': (time.perf_counter() - start) * 1000,
+        'stats': scheduler.stats.summary() if scheduler.stats is not None else None,
+    }
+
+
+def _generate_chunk(output_dir, output_format, chunk):
+    """Worker side: generate a chunk of profiles with the worker's generator"""
+    return [generate_file(name, text, fmt, sh_batch._worker_scheduler, output_dir, output_format)
+            for name, text, fmt in chunk]
+
+
+def run(profiles, strategy=DEFAULT_STRATEGY, workers=1, output_dir='.', output_format='yaml', instrument=False):
+    """Yield a result dict per profile, in input order, using worker processes when workers != 1"""
+    if workers == 1:
+        scheduler = ScheduleGenerator(strategy, instrument=instrument)
+        for name, text, fmt in profiles:
+            yield generate_file(name, text, fmt, scheduler, output_dir, output_format)
+        return
+    task = partial(_generate_chunk, output_dir, output_format)
+    initargs = (strategy, False, False, None, False, instrument)
+    for chunk, results, error in sh_batch.map_chunks(task, profiles, workers or None, 4, initargs):
+        if error is not None:
+            results = [{'name': name, 'error': f"{type(error).__name__}: {error}"} for name, _, _ in chunk]
+        yield from results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate weekly schedules. With no profiles, asks for your preferences interactively.")
+    parser.add_argument('profiles', nargs='*',
+                        help="user_data profile files (.json/.yaml), directories of them, or '-' for stdin")
+    parser.add_argument('--strategy', default=DEFAULT_STRATEGY, choices=['greedy', *ALLOCATION_STRATEGIES],
+                        help="learning-goal allocation strategy")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="worker processes; 0 uses every core (default: 1)")
+    parser.add_argument('-f', '--format', default='yaml', choices=list(sh_io.FORMATS),
+                        help="output format (default: yaml)")
+    parser.add_argument('-o', '--output-dir', default='.', help="directory for <name>_schedule files")
+    parser.add_argument('--stats', action='store_true', help="print per-profile and per-stage timings")
+    args = parser.parse_args(argv)
+
+    if not args.profiles:
+        ScheduleGenerator(args.strategy).generate_schedule()
+        return 0
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    started = time.perf_counter()
+    count = failed = 0
+    results = run(iter_profiles(args.profiles), args.strategy, args.workers, args.output_dir,
+                  args.format, args.stats)
+    for result in results:
+        count += 1
+        if 'error' in result:
+            failed += 1
+            print(f"{result['name']}: {result['error']}", file=sys.stderr)
+            continue
+        print(result['filename'])
+        if args.stats:
+            print(f"{result['name']}: {result['entries']} entries in {result['ms']:.2f} ms", file=sys.stderr)
+            print(result['stats'], file=sys.stderr)
+    if args.stats:
+        elapsed = time.perf_counter() - started
+        print(f"{count} profiles ({failed} failed) in {elapsed:.2f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,426 @@
 from datetime import datetime, timedelta
-import yaml
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from sys import intern
+import copy
+import heapq
+import json
+import os
+import time
+
+from sh_time import MINUTES_PER_DAY, PREFERRED_WINDOWS, format_clock, format_time, parse_time
+
+# Stages run by run_pipeline when none are given
+DEFAULT_PIPELINE = ('add_fixed_commitments', 'schedule_learning_goals', 'fill_gaps')
+
+# Profile fields that shape every day; changing one of them forces a full rebuild
+CORE_FIELDS = ('sleep_duration', 'wake_up_time', 'cook_dinner', 'cooking_time', 'entertainment_hours')
+
+# Learning-goal allocators besides the built-in greedy first-fit, as 'module:function'.
+# Each is imported on first use and called as
+# allocate(goals, free_slots, already_scheduled, time_budget) -> [(day, goal, start, end)]
+ALLOCATION_STRATEGIES = {
+    'fair': 'sh_solver:allocate_fair',
+    'optimal': 'sh_solver:allocate_optimal',
+}
+
+# Strategy used when none is given
+DEFAULT_STRATEGY = 'fair'
+
+# Lunch for fill_gaps: an hour starting between 11:30 and 13:30, at 12:30 when that is free
+LUNCH_RULE = {'task': 'Lunch Break', 'type': 'break', 'minutes': 60,
+              'window': (11 * 60 + 30, 14 * 60 + 30), 'at': 12 * 60 + 30}
+
+
+class ScheduleStats:
+    """Stage timings and hot-path counters, collected only when instrumentation is enabled"""
+
+    COUNTERS = ('get_available_slots', 'time_to_minutes', 'entries_added')
 
-class ScheduleGenerator:
     def __init__(self):
+        self.stage_ms = {}
+        self.stage_calls = {}
+        self.counters = {name: 0 for name in self.COUNTERS}
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block and add it to the named stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stage_ms[name] = self.stage_ms.get(name, 0.0) + elapsed
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+
+    def dominant_stage(self):
+        """Name of the stage that took the most time, or None before any stage ran"""
+        return max(self.stage_ms, key=self.stage_ms.get) if self.stage_ms else None
+
+    def to_dict(self):
+        return {
+            'stage_ms': {name: round(ms, 4) for name, ms in self.stage_ms.items()},
+            'stage_calls': dict(self.stage_calls),
+            'counters': dict(self.counters),
+            'dominant_stage': self.dominant_stage(),
+        }
+
+    def summary(self):
+        lines = [f"{name:<30} {ms:10.2f} ms  ({self.stage_calls[name]} calls)"
+                 for name, ms in sorted(self.stage_ms.items(), key=lambda item: -item[1])]
+        lines += [f"{name:<30} {count:10d}" for name, count in self.counters.items()]
+        return '\n'.join(lines)
+
+
+def timed_stage(method):
+    """Time a ScheduleGenerator stage when the generator has stats enabled"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.stats is None:
+            return method(self, *args, **kwargs)
+        with self.stats.stage(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class ScheduleEntry:
+    """A schedule item stored as integer minutes, readable like the legacy
+    {'task', 'start', 'end', 'type'} dict with "HH:MM" start and end"""
+
+    __slots__ = ('task', 'start_min', 'end_min', 'type', 'source')
+    KEYS = ('task', 'start', 'end', 'type')
+
+    def __init__(self, task, start_min, end_min, entry_type, source=None):
+        self.task = intern(task)
+        self.start_min = start_min
+        self.end_min = end_min
+        self.type = intern(entry_type)
+        # The fixed_classes or learning_goals dict this entry was generated from, if any
+        self.source = source
+
+    @property
+    def start(self):
+        return format_time(self.start_min)
+
+    @property
+    def end(self):
+        return format_time(self.end_min)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.KEYS:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def keys(self):
+        return list(self.KEYS)
+
+    def to_dict(self):
+        """Return the legacy dict form used in saved files"""
+        return {'task': self.task, 'start': self.start, 'end': self.end, 'type': self.type}
+
+    def __eq__(self, other):
+        if not isinstance(other, ScheduleEntry):
+            return NotImplemented
+        return (self.task, self.start_min, self.end_min, self.type) == \
+            (other.task, other.start_min, other.end_min, other.type)
+
+    def __repr__(self):
+        return f"ScheduleEntry({self.task!r}, {self.start}-{self.end}, {self.type!r})"
+
+
+class FreeSlotIndex:
+    """Sorted free intervals of one day, updated incrementally as busy time is reserved"""
+
+    def __init__(self, day_start, day_end):
+        self.day_start = day_start
+        self.day_end = day_end
+        # Parallel sorted lists of disjoint, non-empty free intervals [start, end)
+        self.starts = [day_start] if day_start < day_end else []
+        self.ends = [day_end] if day_start < day_end else []
+        self._slots = None
+        # preferred_time window -> free gaps clipped to it, longest first; rebuilt after a change
+        self._windows = None
+
+    def reserve(self, start, end):
+        """Mark [start, end) as busy, splitting or trimming the free intervals it touches"""
+        starts, ends = self.starts, self.ends
+        lo = bisect_right(ends, start)
+        if lo == len(starts):
+            return
+        if end <= start:
+            # Zero-length items still split the free interval they fall inside
+            if starts[lo] < start:
+                starts.insert(lo + 1, start)
+                ends.insert(lo, start)
+                self._slots = self._windows = None
+            return
+
+        hi = bisect_left(starts, end)
+        if lo >= hi:
+            return
+
+        new_starts, new_ends = [], []
+        if starts[lo] < start:
+            new_starts.append(starts[lo])
+            new_ends.append(start)
+        if ends[hi - 1] > end:
+            new_starts.append(end)
+            new_ends.append(ends[hi - 1])
+        starts[lo:hi] = new_starts
+        ends[lo:hi] = new_ends
+        self._slots = self._windows = None
+
+    def copy(self):
+        clone = FreeSlotIndex(self.day_start, self.day_end)
+        clone.starts, clone.ends = list(self.starts), list(self.ends)
+        return clone
+    
+    def slots(self):
+        """Return all free intervals as a list of (start, end) tuples"""
+        if self._slots is None:
+            self._slots = list(zip(self.starts, self.ends))
+        return list(self._slots)
+
+    def window_gaps(self, window):
+        """Free intervals clipped to a PREFERRED_WINDOWS window, longest first (earliest among equals)"""
+        if self._windows is None:
+            self._windows = {name: [] for name in PREFERRED_WINDOWS}
+            for start, end in zip(self.starts, self.ends):
+                for name, (window_start, window_end) in PREFERRED_WINDOWS.items():
+                    if start < window_end and end > window_start:
+                        self._windows[name].append((max(start, window_start), min(end, window_end)))
+            for gaps in self._windows.values():
+                gaps.sort(key=lambda gap: gap[0] - gap[1])
+        return self._windows[window]
+
+
+class Conflict:
+    """Two entries whose times overlap, reported on the day the later one starts"""
+
+    __slots__ = ('day', 'first', 'second', 'spans')
+
+    def __init__(self, day, first, second, spans=None):
+        self.day = day
+        self.first = first
+        self.second = second
+        # ((start, end), (start, end)) in the minutes of day, for entries that cross midnight
+        self.spans = spans
+
+    def sources(self):
+        """The fixed_classes items behind the two entries (None for sleep and meals)"""
+        return self.first.source, self.second.source
+
+    def describe(self):
+        if self.spans is None:
+            first = f"{self.first.start}-{self.first.end}"
+            second = f"{self.second.start}-{self.second.end}"
+        else:
+            (first_start, first_end), (second_start, second_end) = self.spans
+            first = f"{format_clock(first_start)}-{format_clock(first_end)}"
+            second = f"{format_clock(second_start)}-{format_clock(second_end)}"
+        return f"{self.day}: {self.first.task} ({first}) overlaps {self.second.task} ({second})"
+
+    def __repr__(self):
+        return f"Conflict({self.describe()!r})"
+
+
+def _overlapping_pairs(rows):
+    """(earlier, later) for every overlapping pair of (start, end, entry) rows sorted by start.
+
+    O(n log n + k) for k pairs: each row overlaps exactly the earlier rows
+    still running when it starts. Zero-length rows and rows that merely
+    touch never overlap.
+    """
+    running = []  # heap of (end, position, row)
+    for position, row in enumerate(rows):
+        if row[1] <= row[0]:
+            continue
+        while running and running[0][0] <= row[0]:
+            heapq.heappop(running)
+        for _, _, other in running:
+            yield other, row
+        heapq.heappush(running, (row[1], position, row))
+
+
+class WeekTimeline:
+    """Entries of a week on one minute-of-week axis, 0 being Monday 00:00.
+
+    An entry kept on day d as [start_min, end_min) covers
+    [d * 1440 + start_min, d * 1440 + end_min), so prep before midnight falls
+    on the previous evening and recovery after midnight on the next morning.
+    The axis wraps after Sunday, and sleep stored as an evening half and a
+    00:00 half on the next day becomes a single interval. Rows are sorted
+    once; a day is a bisect slice of them.
+    """
+
+    def __init__(self, days, rows):
+        self.days = list(days)
+        self.length = len(self.days) * MINUTES_PER_DAY
+        # (start, end, entry) with 0 <= start < length; end may run past the end of the week
+        self.rows = sorted(rows, key=lambda row: row[0])
+        self.starts = [row[0] for row in self.rows]
+
+    @classmethod
+    def from_scheduler(cls, scheduler, types=None):
+        """Timeline of a scheduler's entries of the given types (None for all)"""
+        days = scheduler.days
+        items = [(position, item) for position, day in enumerate(days)
+                 for item in scheduler.schedule[day] if types is None or item.type in types]
+        # (day position, task, type) -> an entry starting at 00:00 that may continue the night before
+        mornings = {}
+        for position, item in items:
+            if item.start_min == 0:
+                mornings.setdefault((position, item.task, item.type), item)
+
+        length = len(days) * MINUTES_PER_DAY
+        rows = []
+        joined = set()
+        for position, item in items:
+            if id(item) in joined:
+                continue
+            duration = item.end_min - item.start_min
+            # Sleep crossing midnight is stored as ending at 23:59 or 24:00 on its first day
+            if item.end_min in (MINUTES_PER_DAY - 1, MINUTES_PER_DAY) and item.start_min > 0:
+                morning = mornings.pop(((position + 1) % len(days), item.task, item.type), None)
+                if morning is not None:
+                    joined.add(id(morning))
+                    duration = MINUTES_PER_DAY - item.start_min + morning.end_min
+            start = (position * MINUTES_PER_DAY + item.start_min) % length
+            rows.append((start, start + duration, item))
+        if joined:
+            rows = [row for row in rows if id(row[2]) not in joined]
+        return cls(days, rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def day(self, day):
+        """(start, end, entry) rows starting on day, in start order and that day's minutes;
+        end is past 1440 for items running beyond midnight"""
+        offset = self.days.index(day) * MINUTES_PER_DAY
+        lo = bisect_left(self.starts, offset)
+        hi = bisect_left(self.starts, offset + MINUTES_PER_DAY, lo)
+        return [(start - offset, end - offset, entry) for start, end, entry in self.rows[lo:hi]]
+
+    def conflicts(self, days=None):
+        """Every overlapping pair, including pairs that only meet across midnight or the week's end"""
+        # Items running past Sunday midnight also cover the start of Monday
+        wrapped = [(start - self.length, end - self.length, entry)
+                   for start, end, entry in self.rows if end > self.length]
+        conflicts = []
+        for first, second in _overlapping_pairs(wrapped + self.rows):
+            if second[0] < 0:
+                continue
+            offset = second[0] - second[0] % MINUTES_PER_DAY
+            day = self.days[offset // MINUTES_PER_DAY]
+            if days is not None and day not in days:
+                continue
+            spans = ((first[0] - offset, first[1] - offset), (second[0] - offset, second[1] - offset))
+            conflicts.append(Conflict(day, first[2], second[2], spans))
+        return conflicts
+
+
+def find_batch_conflicts(schedulers, types=('fixed',)):
+    """(profile index, Conflict) for every conflict in a batch of generated schedules"""
+    for index, scheduler in enumerate(schedulers):
+        for conflict in scheduler.find_conflicts(types):
+            yield index, conflict
+
+
+class FeasibilityReport:
+    """Problems in a profile found from its fixed commitments, before flexible time is allocated"""
+
+    def __init__(self, free_slots, conflicts=()):
+        # day -> [(start, end)] left free by fixed commitments
+        self.free_slots = free_slots
+        # Overlapping pairs among the fixed commitments themselves
+        self.conflicts = list(conflicts)
+        # Histogram of free gaps: sorted lengths with suffix sums, so threshold queries are bisects
+        self.gap_lengths = sorted(end - start for slots in free_slots.values() for start, end in slots)
+        self._suffix = [0] * (len(self.gap_lengths) + 1)
+        for i in range(len(self.gap_lengths) - 1, -1, -1):
+            self._suffix[i] = self._suffix[i + 1] + self.gap_lengths[i]
+        self.errors = []
+        self.warnings = []
+
+    @property
+    def feasible(self):
+        return not self.errors
+
+    @property
+    def longest_gap(self):
+        return self.gap_lengths[-1] if self.gap_lengths else 0
+
+    def gaps_at_least(self, minutes):
+        """Number of free gaps of at least minutes"""
+        return len(self.gap_lengths) - bisect_left(self.gap_lengths, minutes)
+
+    def usable_minutes(self, min_length, max_length=None):
+        """Free minutes in gaps of at least min_length, counting at most max_length per gap"""
+        lengths = self.gap_lengths
+        first = bisect_left(lengths, min_length)
+        if max_length is None:
+            return self._suffix[first]
+        capped = max(first, bisect_left(lengths, max_length))
+        return self._suffix[first] - self._suffix[capped] + max_length * (len(lengths) - capped)
+
+
+def _fit_rule(rule, gap_start, gap_end):
+    """Start of a fill_gaps rule's item in a free gap, or None when the gap cannot take it"""
+    if gap_end - gap_start < rule.get('min_gap', rule['minutes']):
+        return None
+    window_start, window_end = rule.get('window') or (gap_start, gap_end)
+    earliest = max(gap_start, window_start)
+    latest = min(gap_end, window_end) - rule['minutes']
+    if latest < earliest:
+        return None
+    at = rule.get('at')
+    return earliest if at is None else min(max(at, earliest), latest)
+
+
+class ScheduleGenerator:
+    def __init__(self, strategy=DEFAULT_STRATEGY, time_budget=1.0, instrument=False):
+        if strategy != 'greedy' and strategy not in ALLOCATION_STRATEGIES:
+            raise ValueError(f"Unknown allocation strategy: {strategy}")
+        # ScheduleStats when instrumentation is on; None keeps the hot paths to one check
+        self.stats = ScheduleStats() if instrument else None
+        # How learning goals are placed, and the seconds a solver strategy may spend
+        self.strategy = strategy
+        self.time_budget = time_budget
         self.days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         self.schedule = {day: [] for day in self.days}
         self.user_data = {}
+        # day -> (index, entries list it was built from, number of entries consumed)
+        self._slot_indexes = {}
+        # Stages used for the last full generation, replayed by incremental updates
+        self.pipeline = DEFAULT_PIPELINE
+        # Optional sh_cache.FixedLayoutCache shared between generators
+        self.layout_cache = None
+    
+    def reset_schedule(self):
+        """Clear all generated entries"""
+        self.schedule = {day: [] for day in self.days}
+        self._slot_indexes = {}
+    
+    def load_user_data(self, user_data):
+        """Use an existing user_data profile instead of prompting, clearing any previous schedule"""
+        self.user_data = dict(user_data)
+        self.user_data['fixed_classes'] = list(user_data.get('fixed_classes', []))
+        self.user_data['learning_goals'] = sorted(user_data.get('learning_goals', []),
+                                                  key=lambda x: x['priority'], reverse=True)
+        self.reset_schedule()
         
     def collect_user_data(self):
         """Collect all user preferences and constraints"""
@@ -78,36 +493,32 @@ class ScheduleGenerator:
         
     def time_to_minutes(self, time_str):
         """Convert time string to minutes since midnight"""
-        time_str = time_str.strip()
-        
-        # Handle different time formats
-        if ':' in time_str:
-            # Format: HH:MM or H:MM
-            parts = time_str.split(':')
-            if len(parts) == 2:
-                hours, minutes = map(int, parts)
-            else:
-                raise ValueError(f"Invalid time format: {time_str}")
-        else:
-            # Format: just hour (e.g., "7" or "07")
-            hours = int(time_str)
-            minutes = 0
-            
-        # Validate time
-        if not (0 <= hours <= 23 and 0 <= minutes <= 59):
-            raise ValueError(f"Invalid time: {time_str}")
-            
-        return hours * 60 + minutes
+        if self.stats is not None:
+            self.stats.counters['time_to_minutes'] += 1
+        return parse_time(time_str)
     
     def minutes_to_time(self, minutes):
         """Convert minutes since midnight to HH:MM"""
-        minutes = int(minutes)  # Ensure we have an integer
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours:02d}:{mins:02d}"
+        return format_time(minutes)
     
+    def add_entry(self, day, task, start_min, end_min, entry_type, source=None):
+        """Append an entry to a day's schedule and return it"""
+        entry = ScheduleEntry(task, int(start_min), int(end_min), entry_type, source)
+        self.schedule[day].append(entry)
+        if self.stats is not None:
+            self.stats.counters['entries_added'] += 1
+        return entry
+    
+    @timed_stage
     def add_fixed_commitments(self):
         """Add fixed classes and cooking to schedule"""
+        # A cached layout only applies to a schedule that is still empty
+        layout_key = None
+        if self.layout_cache is not None and not any(self.schedule.values()):
+            layout_key = self.layout_cache.key(self.user_data)
+            if self.layout_cache.restore(self, layout_key):
+                return
+        
         # Add sleep
         wake_time = self.time_to_minutes(self.user_data['wake_up_time'])
         sleep_duration_mins = self.user_data['sleep_duration'] * 60
@@ -116,126 +527,209 @@ class ScheduleGenerator:
         for day in self.days:
             # Add sleep
             if sleep_time < wake_time:
-                self.schedule[day].append({
-                    'task': 'Sleep',
-                    'start': self.minutes_to_time(sleep_time),
-                    'end': self.user_data['wake_up_time'],
-                    'type': 'fixed'
-                })
+                self.add_entry(day, 'Sleep', sleep_time, wake_time, 'fixed')
             else:
                 # Sleep crosses midnight
-                self.schedule[day].append({
-                    'task': 'Sleep',
-                    'start': self.minutes_to_time(sleep_time),
-                    'end': '23:59',
-                    'type': 'fixed'
-                })
-                self.schedule[day].append({
-                    'task': 'Sleep',
-                    'start': '00:00',
-                    'end': self.user_data['wake_up_time'],
-                    'type': 'fixed'
-                })
+                self.add_entry(day, 'Sleep', sleep_time, 23 * 60 + 59, 'fixed')
+                self.add_entry(day, 'Sleep', 0, wake_time, 'fixed')
             
             # Add cooking
             if self.user_data['cook_dinner']:
                 cooking_duration = int(self.user_data['cooking_time'] * 60)
                 # Default dinner time 18:00-20:00, adjust based on cooking time
                 dinner_start = 18 * 60  # 18:00
-                self.schedule[day].append({
-                    'task': 'Cooking Dinner',
-                    'start': self.minutes_to_time(dinner_start),
-                    'end': self.minutes_to_time(dinner_start + cooking_duration),
-                    'type': 'fixed'
-                })
+                self.add_entry(day, 'Cooking Dinner', dinner_start, dinner_start + cooking_duration, 'fixed')
                 
                 # Add dinner time (30 minutes after cooking)
                 dinner_time = dinner_start + cooking_duration
-                self.schedule[day].append({
-                    'task': 'Dinner',
-                    'start': self.minutes_to_time(dinner_time),
-                    'end': self.minutes_to_time(dinner_time + 60),
-                    'type': 'fixed'
-                })
+                self.add_entry(day, 'Dinner', dinner_time, dinner_time + 60, 'fixed')
         
         # Add fixed classes
         for class_info in self.user_data['fixed_classes']:
-            for day in class_info['days']:
-                if day in self.days:
-                    start_mins = self.time_to_minutes(class_info['start_time'])
-                    end_mins = self.time_to_minutes(class_info['end_time'])
-                    
-                    # Add prep time
-                    if class_info['prep_time'] > 0:
-                        prep_duration = int(class_info['prep_time'] * 60)
-                        prep_start = start_mins - prep_duration
-                        self.schedule[day].append({
-                            'task': f"{class_info['name']} - Preparation",
-                            'start': self.minutes_to_time(prep_start),
-                            'end': class_info['start_time'],
-                            'type': 'fixed'
-                        })
-                    
-                    # Add main class
-                    self.schedule[day].append({
-                        'task': class_info['name'],
-                        'start': class_info['start_time'],
-                        'end': class_info['end_time'],
-                        'type': 'fixed'
-                    })
-                    
-                    # Add recovery time
-                    if class_info['post_time'] > 0:
-                        post_duration = int(class_info['post_time'] * 60)
-                        self.schedule[day].append({
-                            'task': f"{class_info['name']} - Recovery",
-                            'start': class_info['end_time'],
-                            'end': self.minutes_to_time(end_mins + post_duration),
-                            'type': 'fixed'
-                        })
+            self.add_class_entries(class_info)
+        
+        if layout_key is not None:
+            self.layout_cache.store(self, layout_key)
     
-    def get_available_slots(self, day):
-        """Get available time slots for a given day"""
-        day_schedule = sorted(self.schedule[day], key=lambda x: self.time_to_minutes(x['start']))
-        available_slots = []
+    def add_class_entries(self, class_info):
+        """Add one fixed class with its prep and recovery time on each of its days"""
+        for day in class_info['days']:
+            if day in self.days:
+                start_mins = self.time_to_minutes(class_info['start_time'])
+                end_mins = self.time_to_minutes(class_info['end_time'])
+                
+                # Add prep time
+                if class_info['prep_time'] > 0:
+                    prep_duration = int(class_info['prep_time'] * 60)
+                    self.add_entry(day, f"{class_info['name']} - Preparation",
+                                   start_mins - prep_duration, start_mins, 'fixed', class_info)
+                
+                # Add main class
+                self.add_entry(day, class_info['name'], start_mins, end_mins, 'fixed', class_info)
+                
+                # Add recovery time
+                if class_info['post_time'] > 0:
+                    post_duration = int(class_info['post_time'] * 60)
+                    self.add_entry(day, f"{class_info['name']} - Recovery",
+                                   end_mins, end_mins + post_duration, 'fixed', class_info)
+    
+    def _neighbour_lists(self, day):
+        """Entry lists of the day before, the day itself and the day after (the week wraps)"""
+        position = self.days.index(day)
+        return (self.schedule[self.days[position - 1]], self.schedule[day],
+                self.schedule[self.days[(position + 1) % len(self.days)]])
+    
+    def get_slot_index(self, day):
+        """Return the free-slot index for a day, catching up on entries appended since the last call
         
-        current_time = self.time_to_minutes(self.user_data['wake_up_time'])
-        end_of_day = self.time_to_minutes(self.user_data['wake_up_time']) + 24 * 60 - self.user_data['sleep_duration'] * 60
+        Fixed time spilling over midnight from the neighbouring days counts
+        too: last night's recovery in the morning, and the next day's early
+        commitments when the waking window runs past midnight.
+        """
+        wake_time = self.time_to_minutes(self.user_data['wake_up_time'])
+        end_of_day = wake_time + 24 * 60 - self.user_data['sleep_duration'] * 60
+        lists = self._neighbour_lists(day)
         
-        for item in day_schedule:
-            if item['type'] == 'fixed':
-                item_start = self.time_to_minutes(item['start'])
-                if current_time < item_start:
-                    available_slots.append((current_time, item_start))
-                current_time = max(current_time, self.time_to_minutes(item['end']))
+        cached = self._slot_indexes.get(day)
+        if cached is not None:
+            index, indexed_lists, consumed = cached
+            # Rebuild when a list was replaced, shrunk, or the waking window moved
+            if (index.day_start != wake_time or index.day_end != end_of_day
+                    or any(entries is not indexed or count > len(entries)
+                           for entries, indexed, count in zip(lists, indexed_lists, consumed))):
+                cached = None
+        if cached is None:
+            index, consumed = FreeSlotIndex(wake_time, end_of_day), (0, 0, 0)
         
-        # Add remaining time at end of day
-        if current_time < end_of_day:
-            available_slots.append((current_time, end_of_day))
+        before, entries, after = lists
+        for item in before[consumed[0]:]:
+            if item.end_min > MINUTES_PER_DAY and item.type == 'fixed':
+                index.reserve(item.start_min - MINUTES_PER_DAY, item.end_min - MINUTES_PER_DAY)
+        for item in entries[consumed[1]:]:
+            if item.type == 'fixed':
+                index.reserve(item.start_min, item.end_min)
+        for item in after[consumed[2]:]:
+            if item.start_min + MINUTES_PER_DAY < end_of_day and item.type == 'fixed':
+                index.reserve(item.start_min + MINUTES_PER_DAY, item.end_min + MINUTES_PER_DAY)
         
-        return available_slots
+        self._slot_indexes[day] = (index, lists, (len(before), len(entries), len(after)))
+        return index
     
-    def schedule_learning_goals(self):
-        """Schedule learning goals based on priority and preferences"""
-        # Calculate how much time each goal needs per day on average
-        goal_daily_minutes = {}
-        for goal in self.user_data['learning_goals']:
-            goal_daily_minutes[goal['name']] = (goal['weekly_hours'] * 60) / 7
+    def get_available_slots(self, day):
+        """Get available time slots for a given day"""
+        if self.stats is not None:
+            self.stats.counters['get_available_slots'] += 1
+        return self.get_slot_index(day).slots()
+    
+    def timeline(self, types=None):
+        """The schedule as one WeekTimeline, with sleep across midnight as a single item"""
+        return WeekTimeline.from_scheduler(self, types)
+    
+    def find_conflicts(self, types=('fixed',), days=None):
+        """Every pair of overlapping entries of the given types (None for all) over the week"""
+        return self.timeline(types).conflicts(days)
+    
+    def check_feasibility(self):
+        """Check the loaded user_data for overbooking and learning goals that cannot fit, and collect
+        overlaps among fixed commitments; the current schedule is left untouched"""
+        scratch = ScheduleGenerator()
+        scratch.user_data = self.user_data
+        scratch.add_fixed_commitments()
+        report = FeasibilityReport({day: scratch.get_available_slots(day) for day in self.days},
+                                   scratch.find_conflicts())
+        user_data = self.user_data
+
+        # Weekly total of everything the profile commits to
+        committed = user_data['sleep_duration'] * 7 + user_data['entertainment_hours']
+        if user_data['cook_dinner']:
+            committed += user_data['cooking_time'] * 7
+        for class_info in user_data['fixed_classes']:
+            duration = (self.time_to_minutes(class_info['end_time'])
+                        - self.time_to_minutes(class_info['start_time'])) / 60
+            committed += (duration + class_info['prep_time'] + class_info['post_time']) * len(class_info['days'])
+        goal_hours = sum(goal['weekly_hours'] for goal in user_data['learning_goals'])
+        committed += goal_hours
+        if committed > 168:
+            report.errors.append(f"Schedule overbooked by {committed - 168:.1f} hours per week. "
+                                 "Reduce learning goals, entertainment time, or appointments.")
+
+        for day, slots in report.free_slots.items():
+            if not slots:
+                report.warnings.append(f"{day}: no free time left after fixed commitments")
+
+        for goal in user_data['learning_goals']:
+            min_session_mins = int(goal['min_session'] * 60)
+            max_session_mins = int(goal['max_session'] * 60)
+            if report.gaps_at_least(min_session_mins) == 0:
+                report.errors.append(
+                    f"Learning goal '{goal['name']}': a {goal['min_session']:g} h minimum session does not fit "
+                    f"in any free gap (longest is {report.longest_gap / 60:.1f} h)")
+                continue
+            usable = report.usable_minutes(min_session_mins, max(min_session_mins, max_session_mins))
+            if usable < goal['weekly_hours'] * 60:
+                report.warnings.append(
+                    f"Learning goal '{goal['name']}': at most {usable / 60:.1f} of {goal['weekly_hours']:g} "
+                    f"weekly hours fit in free gaps of {goal['min_session']:g} h or more")
+
+        free_hours = report.usable_minutes(0) / 60
+        if goal_hours > free_hours:
+            report.warnings.append(f"Learning goals need {goal_hours:g} h per week "
+                                   f"but only {free_hours:.1f} h is free")
+        return report
+
+    def occupancy(self, types=('fixed',)):
+        """Minute-resolution 7x1440 occupancy of the week (requires NumPy)"""
+        from sh_occupancy import WeekOccupancy
+        return WeekOccupancy.from_scheduler(self, types)
+    
+    @timed_stage
+    def schedule_learning_goals(self, goals=None, days=None):
+        """Schedule learning goals based on priority and preferences
+        
+        goals and days restrict the run to a subset; time already scheduled
+        for a goal on other days counts towards its weekly target. A session
+        goes in the longest free stretch of the goal's preferred_time window
+        when that holds min_session, otherwise in the first gap that does.
+        """
+        goals = self.user_data['learning_goals'] if goals is None else goals
+        days = self.days if days is None else days
         
         # Track scheduled time for each goal
-        scheduled_time = {goal['name']: 0 for goal in self.user_data['learning_goals']}
+        scheduled_time = {goal['name']: 0 for goal in goals}
+        for day in self.days:
+            for item in self.schedule[day]:
+                if item.type == 'learning' and item.task in scheduled_time:
+                    scheduled_time[item.task] += item.end_min - item.start_min
         
+        if self.strategy == 'greedy':
+            sessions = self._greedy_sessions(goals, days, scheduled_time)
+        else:
+            free_slots = {day: self.get_available_slots(day) for day in days}
+            sessions = self._allocator()(goals, free_slots, scheduled_time, self.time_budget)
+        for day, goal, start_mins, end_mins in sessions:
+            self.add_entry(day, goal['name'], start_mins, end_mins, 'learning', goal)
+    
+    def _greedy_sessions(self, goals, days, scheduled_time):
+        """Greedy allocation: each goal in turn takes at most one session a day, first fit after
+        its preferred window, until its weekly hours are met. Placement only looks at fixed
+        time, so goals never displace one another."""
+        scheduled_time = dict(scheduled_time)
+        sessions = []
         # Schedule high-priority goals first
-        for goal in self.user_data['learning_goals']:
+        for goal in goals:
             target_weekly_mins = goal['weekly_hours'] * 60
             min_session_mins = int(goal['min_session'] * 60)
             max_session_mins = int(goal['max_session'] * 60)
             
-            for day in self.days:
+            for day in days:
                 if scheduled_time[goal['name']] >= target_weekly_mins:
                     break
                     
                 available_slots = self.get_available_slots(day)
+                if goal.get('preferred_time') in PREFERRED_WINDOWS:
+                    # The longest free stretch inside the preferred window, then first fit as before
+                    available_slots = (self.get_slot_index(day).window_gaps(goal['preferred_time'])[:1]
+                                       + available_slots)
                 
                 for start_mins, end_mins in available_slots:
                     slot_duration = end_mins - start_mins
@@ -247,86 +741,75 @@ class ScheduleGenerator:
                         session_length = int(session_length)  # Ensure integer
                         
                         if session_length >= min_session_mins:
-                            # Add to schedule
-                            self.schedule[day].append({
-                                'task': goal['name'],
-                                'start': self.minutes_to_time(start_mins),
-                                'end': self.minutes_to_time(start_mins + session_length),
-                                'type': 'learning'
-                            })
-                            
+                            sessions.append((day, goal, start_mins, start_mins + session_length))
                             scheduled_time[goal['name']] += session_length
                             break
+        return sessions
     
-    def add_routine_tasks(self):
+    def _allocator(self):
+        module_name, function_name = ALLOCATION_STRATEGIES[self.strategy].split(':')
+        return getattr(__import__(module_name), function_name)
+    
+    def filler_rules(self):
+        """Gap-filling rules for the loaded user_data, in the order fill_gaps applies them"""
+        entertainment_per_day = (self.user_data['entertainment_hours'] * 60) / 7
+        return [
+            dict(LUNCH_RULE),
+            # Max 2 hours per day, in a gap that could hold the whole daily share
+            {'task': 'Entertainment/Free Time', 'type': 'entertainment',
+             'minutes': int(min(entertainment_per_day, 120)), 'min_gap': entertainment_per_day},
+        ]
+    
+    @timed_stage
+    def fill_gaps(self, days=None, rules=None):
+        """Place lunch, breaks and entertainment in a single walk over each day's free gaps
+        
+        rules are dicts with task, type and minutes, plus optional min_gap
+        (gap length needed, default minutes), window (earliest start, latest
+        end) and at (preferred start; otherwise as early as possible). Gaps
+        are visited in time order and each takes the first pending rule that
+        fits; what is left of the gap on either side stays open for the rest.
+        Everything already on the day, learning included, is avoided.
+        """
+        rules = [rule for rule in (self.filler_rules() if rules is None else rules) if rule['minutes'] > 0]
+        for day in self.days if days is None else days:
+            index = self.get_slot_index(day)
+            placed = [item for item in self.schedule[day] if item.type != 'fixed']
+            if placed:
+                index = index.copy()
+                for item in placed:
+                    index.reserve(item.start_min, item.end_min)
+            
+            pending = list(rules)
+            # Stack of open gaps, earliest on top
+            gaps = index.slots()[::-1]
+            while pending and gaps:
+                gap_start, gap_end = gaps.pop()
+                for rule in pending:
+                    start = _fit_rule(rule, gap_start, gap_end)
+                    if start is not None:
+                        end = start + rule['minutes']
+                        self.add_entry(day, rule['task'], start, end, rule['type'])
+                        pending.remove(rule)
+                        gaps.extend(gap for gap in ((end, gap_end), (gap_start, start)) if gap[1] > gap[0])
+                        break
+    
+    def add_routine_tasks(self, days=None):
         """Add routine tasks like meals and breaks"""
-        for day in self.days:
-            # Add lunch break if there's space around noon
-            available_slots = self.get_available_slots(day)
-            for start_mins, end_mins in available_slots:
-                if 11 * 60 <= start_mins <= 14 * 60 and (end_mins - start_mins) >= 60:
-                    self.schedule[day].append({
-                        'task': 'Lunch Break',
-                        'start': '12:30',
-                        'end': '13:30',
-                        'type': 'break'
-                    })
-                    break
+        self.fill_gaps(days, [rule for rule in self.filler_rules() if rule['type'] == 'break'])
     
     def schedule_flexible_tasks(self, tasks, task_type):
         """Generic method to schedule flexible tasks"""
         if task_type == 'learning':
             self.schedule_learning_goals()
     
-    def schedule_entertainment(self):
+    def schedule_entertainment(self, days=None):
         """Schedule entertainment time"""
-        entertainment_per_day = (self.user_data['entertainment_hours'] * 60) / 7
-        
-        for day in self.days:
-            available_slots = self.get_available_slots(day)
-            for start_mins, end_mins in available_slots:
-                slot_duration = end_mins - start_mins
-                if slot_duration >= entertainment_per_day:
-                    entertainment_duration = int(min(entertainment_per_day, 120))  # Max 2 hours per day
-                    self.schedule[day].append({
-                        'task': 'Entertainment/Free Time',
-                        'start': self.minutes_to_time(start_mins),
-                        'end': self.minutes_to_time(start_mins + entertainment_duration),
-                        'type': 'entertainment'
-                    })
-                    break
+        self.fill_gaps(days, [rule for rule in self.filler_rules() if rule['type'] == 'entertainment'])
     
-    def add_breaks_and_entertainment(self):
+    def add_breaks_and_entertainment(self, days=None):
         """Add breaks, meals, and entertainment time"""
-        entertainment_per_day = (self.user_data['entertainment_hours'] * 60) / 7
-        
-        for day in self.days:
-            available_slots = self.get_available_slots(day)
-            
-            # Add lunch break
-            for start_mins, end_mins in available_slots:
-                if 12 * 60 <= start_mins <= 14 * 60 and (end_mins - start_mins) >= 60:
-                    self.schedule[day].append({
-                        'task': 'Lunch Break',
-                        'start': '12:30',
-                        'end': '13:30',
-                        'type': 'break'
-                    })
-                    break
-            
-            # Add entertainment time
-            available_slots = self.get_available_slots(day)
-            for start_mins, end_mins in available_slots:
-                slot_duration = end_mins - start_mins
-                if slot_duration >= entertainment_per_day:
-                    entertainment_duration = int(min(entertainment_per_day, 120))  # Max 2 hours per day
-                    self.schedule[day].append({
-                        'task': 'Entertainment/Free Time',
-                        'start': self.minutes_to_time(start_mins),
-                        'end': self.minutes_to_time(start_mins + entertainment_duration),
-                        'type': 'entertainment'
-                    })
-                    break
+        self.fill_gaps(days)
     
     def print_schedule(self):
         """Print the generated schedule"""
@@ -334,32 +817,254 @@ class ScheduleGenerator:
         print("GENERATED WEEKLY SCHEDULE")
         print("="*50)
         
+        timeline = self.timeline()
         for day in self.days:
             print(f"\n{day.upper()}:")
             print("-" * 30)
             
-            day_schedule = sorted(self.schedule[day], key=lambda x: self.time_to_minutes(x['start']))
-            
-            for item in day_schedule:
-                print(f"{item['start']}-{item['end']} | {item['task']}")
-    
-    def save_schedule(self, filename="my_schedule.yaml"):
-        """Save schedule to YAML file"""
-        with open(filename, 'w') as f:
-            yaml.dump({
-                'user_data': self.user_data,
-                'schedule': self.schedule
-            }, f, default_flow_style=False)
+            for start, end, item in timeline.day(day):
+                print(f"{format_clock(start)}-{format_clock(end)} | {item.task}")
+    
+    def to_dict(self):
+        """Return user_data and schedule in the layout written by save_schedule"""
+        return {
+            'user_data': self.user_data,
+            'schedule': {day: [item.to_dict() for item in items] for day, items in self.schedule.items()}
+        }
+    
+    def save_schedule(self, filename="my_schedule.yaml", fmt=None):
+        """Save schedule to a file (YAML unless fmt or the extension picks jsonl/binary);
+        with instrumentation on, stats go to <name>.stats.json beside it"""
+        import sh_io
+        with self.stats.stage('save_schedule') if self.stats is not None else nullcontext():
+            sh_io.save(self, filename, fmt)
         print(f"\nSchedule saved to {filename}")
+        
+        if self.stats is not None:
+            with open(os.path.splitext(filename)[0] + '.stats.json', 'w') as f:
+                json.dump(self.stats.to_dict(), f, indent=2)
+    
+    @classmethod
+    def load_schedule(cls, filename, fmt=None, strategy=DEFAULT_STRATEGY):
+        """Rebuild a generator from a file written by save_schedule, without regenerating"""
+        import sh_io
+        return sh_io.load(filename, fmt, strategy)
+    
+    @classmethod
+    def open_schedule(cls, filename, fmt=None, strategy=DEFAULT_STRATEGY):
+        """Like load_schedule, but each day is parsed only when it is first accessed"""
+        import sh_io
+        return sh_io.open_schedule(filename, fmt, strategy)
+    
+    def run_pipeline(self, stages=None):
+        """Generate the schedule for the loaded user_data without any prompts"""
+        self.pipeline = tuple(stages or DEFAULT_PIPELINE)
+        for stage in self.pipeline:
+            getattr(self, stage)()
+    
+    def copy(self):
+        """Return an independent copy; entry sources point at the copy's own user_data"""
+        clone = ScheduleGenerator(self.strategy, self.time_budget, self.stats is not None)
+        memo = {}
+        clone.user_data = copy.deepcopy(self.user_data, memo)
+        clone.pipeline = self.pipeline
+        clone.layout_cache = self.layout_cache
+        for day, items in self.schedule.items():
+            clone.schedule[day] = [
+                ScheduleEntry(item.task, item.start_min, item.end_min, item.type,
+                              memo.get(id(item.source), item.source))
+                for item in items
+            ]
+        return clone
+    
+    def _remove_entries(self, day, predicate):
+        entries = self.schedule[day]
+        kept = [item for item in entries if not predicate(item)]
+        if len(kept) == len(entries):
+            return
+        entries[:] = kept
+        # Indexes notice a changed list by its length, which later additions can restore, and
+        # the neighbouring days' indexes may have reserved removed time across midnight
+        position = self.days.index(day)
+        for neighbour in (self.days[position - 1], day, self.days[(position + 1) % len(self.days)]):
+            self._slot_indexes.pop(neighbour, None)
+    
+    def _touched_days(self, placed):
+        """Days whose free time depends on the given (day, entry) pairs: their own day, plus the
+        neighbours that get_slot_index lets them reach across midnight"""
+        wake_time = self.time_to_minutes(self.user_data['wake_up_time'])
+        end_of_day = wake_time + 24 * 60 - self.user_data['sleep_duration'] * 60
+        days = set()
+        for day, item in placed:
+            position = self.days.index(day)
+            days.add(day)
+            if item.start_min + MINUTES_PER_DAY < end_of_day:
+                days.add(self.days[position - 1])
+            if item.end_min > MINUTES_PER_DAY:
+                days.add(self.days[(position + 1) % len(self.days)])
+        return days
+    
+    def _replace_fixed_class(self, index, class_info):
+        """Swap fixed_classes[index] and its entries as update_fixed_class does, without
+        rescheduling; return the days whose free time changed"""
+        classes = self.user_data['fixed_classes']
+        old = classes[index] if index < len(classes) else None
+        if class_info is None:
+            del classes[index]
+        elif old is None:
+            classes.append(class_info)
+        else:
+            classes[index] = class_info
+        
+        # (day, entry) for every entry of the old class removed and of the new class added
+        placed = []
+        if old is not None:
+            for day in set(old['days']) & set(self.days):
+                placed.extend((day, item) for item in self.schedule[day] if item.source is old)
+                self._remove_entries(day, lambda item: item.source is old)
+        if class_info is not None:
+            self.add_class_entries(class_info)
+            for day in set(class_info['days']) & set(self.days):
+                placed.extend((day, item) for item in self.schedule[day] if item.source is class_info)
+        return self._touched_days(placed)
+    
+    def _greedy_relayout(self, learning, fixed_days, goal_names):
+        """Learning per day once greedy placement is redone for the goals in goal_names over the
+        whole week and, from the first of fixed_days on, for every other goal not yet complete
+        by then; earlier sessions are kept"""
+        goals = self.user_data['learning_goals']
+        # Goal name -> position of the first day whose sessions are redone
+        redo = dict.fromkeys(goal_names, 0)
+        first = min((self.days.index(day) for day in fixed_days), default=len(self.days))
+        for goal in goals:
+            if goal['name'] not in redo and first < len(self.days):
+                done = sum(item.end_min - item.start_min for day in self.days[:first]
+                           for item in learning[day] if item.task == goal['name'])
+                if done < goal['weekly_hours'] * 60:
+                    redo[goal['name']] = first
+        
+        layout = {day: [item for item in learning[day] if position < redo.get(item.task, len(self.days))]
+                  for position, day in enumerate(self.days)}
+        for start in sorted(set(redo.values())):
+            group = [goal for goal in goals if redo.get(goal['name']) == start]
+            scheduled_time = {goal['name']: 0 for goal in group}
+            for day in self.days[:start]:
+                for item in layout[day]:
+                    if item.task in scheduled_time:
+                        scheduled_time[item.task] += item.end_min - item.start_min
+            for day, goal, start_mins, end_mins in self._greedy_sessions(group, self.days[start:], scheduled_time):
+                layout[day].append(ScheduleEntry(goal['name'], start_mins, end_mins, 'learning', goal))
+        return layout
+    
+    def _joint_relayout(self):
+        """Learning per day from the allocator run over the whole week, as a full rebuild would"""
+        goals = self.user_data['learning_goals']
+        free_slots = {day: self.get_available_slots(day) for day in self.days}
+        sessions = self._allocator()(goals, free_slots, {goal['name']: 0 for goal in goals}, self.time_budget)
+        layout = {day: [] for day in self.days}
+        for day, goal, start_mins, end_mins in sessions:
+            layout[day].append(ScheduleEntry(goal['name'], int(start_mins), int(end_mins), 'learning', goal))
+        return layout
+    
+    def _reschedule_flexible(self, fixed_days=(), goal_names=()):
+        """Redo learning and fillers after fixed time changed on fixed_days or the learning goals
+        called goal_names were edited, rebuilding only days whose fixed time or learning differ"""
+        learning = {day: [item for item in self.schedule[day] if item.type == 'learning'] for day in self.days}
+        if 'schedule_learning_goals' not in self.pipeline:
+            layout = learning
+        elif self.strategy == 'greedy':
+            layout = self._greedy_relayout(learning, fixed_days, goal_names)
+        else:
+            # Solver strategies place all goals jointly, so any edit can move every session
+            layout = self._joint_relayout()
+        
+        def sessions(items):
+            return sorted((item.task, item.start_min, item.end_min) for item in items)
+        
+        days = [day for day in self.days
+                if day in fixed_days or sessions(layout[day]) != sessions(learning[day])]
+        goals = {goal['name']: goal for goal in self.user_data['learning_goals']}
+        for day in self.days:
+            if day not in days:
+                # Sessions left where they were now belong to the edited goal
+                for item in learning[day]:
+                    if item.task in goal_names:
+                        item.source = goals.get(item.task)
+        
+        # Fillers avoid learning, and stages before learning in the pipeline ran without it,
+        # so rebuilt days replay every stage after the fixed commitments in order
+        for day in days:
+            self._remove_entries(day, lambda item: item.type != 'fixed')
+        for stage in self.pipeline:
+            if stage == 'schedule_learning_goals':
+                for day in days:
+                    self.schedule[day].extend(layout[day])
+            elif stage != 'add_fixed_commitments' and days:
+                getattr(self, stage)(days=days)
+    
+    def update_fixed_class(self, index, class_info):
+        """Replace fixed_classes[index] (append when index is past the end, remove when
+        class_info is None) and reschedule only the days the old or new class touches"""
+        days = self._replace_fixed_class(index, class_info)
+        if days:
+            self._reschedule_flexible(days)
+    
+    def update_learning_goal(self, name, goal):
+        """Replace the learning goal called name (add it when unknown, remove it when goal is None)
+        and reschedule the learning and fillers it affects"""
+        goals = self.user_data['learning_goals']
+        old = next((item for item in goals if item['name'] == name), None)
+        if old is not None:
+            if goal is None:
+                goals.remove(old)
+            else:
+                goals[goals.index(old)] = goal
+        elif goal is not None:
+            goals.append(goal)
+        goals.sort(key=lambda x: x['priority'], reverse=True)
+        self._reschedule_flexible(goal_names={name})
+    
+    def apply_user_data(self, user_data):
+        """Switch to a new profile, rescheduling incrementally when only classes or goals changed;
+        all class and goal edits are applied first and rescheduled together"""
+        if not self.user_data or any(self.user_data.get(key) != user_data.get(key) for key in CORE_FIELDS):
+            self.load_user_data(user_data)
+            self.run_pipeline(self.pipeline)
+            return
+        
+        new_classes = [dict(item) for item in user_data.get('fixed_classes', [])]
+        old_classes = self.user_data['fixed_classes']
+        fixed_days = set()
+        for index in range(len(old_classes) - 1, len(new_classes) - 1, -1):
+            fixed_days |= self._replace_fixed_class(index, None)
+        for index, class_info in enumerate(new_classes):
+            if index >= len(old_classes) or old_classes[index] != class_info:
+                fixed_days |= self._replace_fixed_class(index, class_info)
+        
+        new_goals = {item['name']: dict(item) for item in user_data.get('learning_goals', [])}
+        old_goals = {item['name']: item for item in self.user_data['learning_goals']}
+        goal_names = {name for name in old_goals if name not in new_goals}
+        goal_names |= {name for name, goal in new_goals.items() if old_goals.get(name) != goal}
+        # Same order as load_user_data would give; unchanged goals keep the dicts their entries point at
+        self.user_data['learning_goals'] = sorted(
+            (goal if name in goal_names else old_goals[name] for name, goal in new_goals.items()),
+            key=lambda x: x['priority'], reverse=True)
+        if fixed_days or goal_names:
+            self._reschedule_flexible(fixed_days, goal_names)
     
     def generate_schedule(self):
         """Main method to generate the complete schedule"""
         self.collect_user_data()
+        
+        report = self.check_feasibility()
+        for problem in report.errors + report.warnings:
+            print(f"Warning: {problem}")
+        for conflict in report.conflicts:
+            print(f"Warning: {conflict.describe()}")
+        
         print("\nGenerating your personalized schedule...")
         
-        self.add_fixed_commitments()
-        self.schedule_learning_goals()
-        self.add_breaks_and_entertainment()
+        self.run_pipeline()
         
         self.print_schedule()
         
@@ -380,7 +1085,8 @@ class ScheduleGenerator:
         if save_option.lower() == 'y':
             self.save_schedule()
 
-# Example usage
+# Example usage: without arguments this prompts as before; see sh_cli for profile files
 if __name__ == "__main__":
-    scheduler = ScheduleGenerator()
-    scheduler.generate_schedule()
\ No newline at end of file
+    import sys
+    from sh_cli import main
+    sys.exit(main())
\ No newline at end of file
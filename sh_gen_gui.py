@@ -1,8 +1,44 @@
+import time
+_STARTED = time.perf_counter()
+
+import sys
 import tkinter
 import customtkinter as ctk
-from sh_gen import ScheduleGenerator
-import tkinter.messagebox as messagebox
-import re
+from sh_time import clock_to_minutes, validate_time_format
+import queue
+import threading
+
+# How often the Tk loop checks for results from the generation worker (~60fps)
+POLL_INTERVAL_MS = 16
+
+GENERATION_STAGES = ('add_fixed_commitments', 'schedule_learning_goals', 'fill_gaps')
+
+
+def _generate_in_background(user_data, generation, cancel_event, results, previous=None):
+    """Worker thread body: run the generation stages and report progress through the results queue
+
+    When the previous result is given, only the parts of it affected by the
+    edited appointments and goals are recomputed, on a copy of it.
+    """
+    try:
+        from sh_gen import ScheduleGenerator
+        if previous is not None:
+            scheduler = previous.copy()
+            stages = [lambda: scheduler.apply_user_data(user_data)]
+        else:
+            scheduler = ScheduleGenerator()
+            scheduler.load_user_data(user_data)
+            scheduler.pipeline = GENERATION_STAGES
+            stages = [getattr(scheduler, stage) for stage in GENERATION_STAGES]
+        for i, stage in enumerate(stages, 1):
+            # A newer generation was started: stop at the next stage boundary
+            if cancel_event.is_set():
+                return
+            stage()
+            results.put(('progress', generation, i / len(stages)))
+        results.put(('done', generation, scheduler))
+    except Exception as e:
+        results.put(('error', generation, e))
 
 class ScheduleApp(ctk.CTk):
     def __init__(self):
@@ -19,6 +55,22 @@ class ScheduleApp(ctk.CTk):
         self.goal_frames = []
         self.vcmd = (self.register(self._validate_numeric_input), '%P')
 
+        # --- Background Generation ---
+        self.generation_results = queue.Queue()
+        self.generation_id = 0
+        self.generation_cancel = None
+        self.polling_generation = False
+        self.last_scheduler = None
+        # Problems found by validate_all_inputs that do not stop generation
+        self.input_warnings = []
+
+        # --- Secondary Windows (built on first use, then reused) ---
+        self.schedule_window = None
+        self.schedule_view = None
+        self.shown_scheduler = None
+        self.error_window = None
+        self.error_textbox = None
+
         # --- Main Layout ---
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -37,6 +89,25 @@ class ScheduleApp(ctk.CTk):
         generate_button = ctk.CTkButton(self, text="✨ Generate My Schedule ✨", font=("Arial", 18, "bold"), height=50, command=self.run_schedule_generation)
         generate_button.grid(row=1, column=0, pady=(0, 20), padx=10, sticky="ew")
 
+        # Shown only while a schedule is being generated
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.set(0)
+
+        open_button = ctk.CTkButton(self, text="📂 Open Saved Schedule", height=32, command=self.open_saved_schedule)
+        open_button.grid(row=3, column=0, pady=(0, 10), padx=10, sticky="ew")
+
+        # Runs once the event loop is idle, i.e. when the form is first usable
+        self.startup_ms = None
+        self.after_idle(self._first_frame_ready)
+
+    def _first_frame_ready(self):
+        """Record the cold-start time; with --startup-time, report it and exit"""
+        self.update_idletasks()
+        self.startup_ms = (time.perf_counter() - _STARTED) * 1000
+        if '--startup-time' in sys.argv:
+            print(f"First interactive frame after {self.startup_ms:.0f} ms", file=sys.stderr)
+            self.destroy()
+
     def _validate_numeric_input(self, value_if_allowed):
         """Allows only integers or floats."""
         if value_if_allowed == "":
@@ -49,33 +120,7 @@ class ScheduleApp(ctk.CTk):
 
     def _validate_time_format(self, time_str):
         """Validate time format and return standardized format"""
-        if not time_str or time_str.strip() == "":
-            raise ValueError("Time cannot be empty")
-        
-        time_str = time_str.strip()
-        
-        # Check for valid time formats: HH:MM, H:MM, HH, H
-        if ':' in time_str:
-            parts = time_str.split(':')
-            if len(parts) != 2:
-                raise ValueError(f"Invalid time format: {time_str}. Use HH:MM or H:MM")
-            try:
-                hours, minutes = int(parts[0]), int(parts[1])
-            except ValueError:
-                raise ValueError(f"Invalid time format: {time_str}. Hours and minutes must be numbers")
-        else:
-            try:
-                hours = int(time_str)
-                minutes = 0
-            except ValueError:
-                raise ValueError(f"Invalid time format: {time_str}. Use HH:MM, H:MM, or just H")
-        
-        if not (0 <= hours <= 23):
-            raise ValueError(f"Invalid hour: {hours}. Must be between 0-23")
-        if not (0 <= minutes <= 59):
-            raise ValueError(f"Invalid minutes: {minutes}. Must be between 0-59")
-        
-        return f"{hours:02d}:{minutes:02d}"
+        return validate_time_format(time_str)
 
     def _create_spinbox(self, parent, initial_value=0.0, step=0.5):
         """Creates a custom spinbox with an entry and +/- buttons."""
@@ -254,8 +299,10 @@ class ScheduleApp(ctk.CTk):
         })
 
     def validate_all_inputs(self):
-        """Comprehensive validation of all user inputs"""
+        """Comprehensive validation of all user inputs; problems that do not block
+        generation are left in self.input_warnings"""
         errors = []
+        self.input_warnings = []
         
         # Validate wake up time
         try:
@@ -381,44 +428,24 @@ class ScheduleApp(ctk.CTk):
             except ValueError:
                 errors.append(f"Learning Goal {goal_num}: Session times must be valid numbers")
         
-        # Check total weekly hours don't exceed reasonable limits
-        try:
-            total_goal_hours = sum(float(frame["hours"].get() or "0") for frame in active_goals if frame["name"].get().strip())
-            sleep_hours = float(self.sleep_slider.get()) * 7
-            cooking_hours = (float(self.cooking_time_entry.get() or "0") * 7) if self.cook_dinner_check.get() else 0
-            entertainment_hours = float(self.entertainment_slider.get())
-            
-            # Calculate approximate appointment hours (rough estimate)
-            appointment_hours = 0
-            for frame in active_appointments:
-                try:
-                    if frame["start"].get() and frame["end"].get():
-                        start_mins = self._time_to_minutes(self._validate_time_format(frame["start"].get()))
-                        end_mins = self._time_to_minutes(self._validate_time_format(frame["end"].get()))
-                        duration = (end_mins - start_mins) / 60
-                        prep_time = float(frame["prep"].get() or "0")
-                        post_time = float(frame["post"].get() or "0")
-                        total_duration = duration + prep_time + post_time
-                        days_count = sum(1 for var in frame["days"].values() if var.get())
-                        appointment_hours += total_duration * days_count
-                except:
-                    pass
-            
-            total_committed_hours = sleep_hours + cooking_hours + entertainment_hours + appointment_hours + total_goal_hours
-            
-            if total_committed_hours > 168:
-                excess = total_committed_hours - 168
-                errors.append(f"Schedule overbooked by {excess:.1f} hours per week. Reduce learning goals, entertainment time, or appointments.")
-                
-        except ValueError:
-            pass
+        # Once every field parses, check the profile as a whole: weekly overbooking and
+        # learning goals whose minimum session fits in no free gap block generation, while
+        # goals that only partly fit and overlapping sleep, meals, appointments and their
+        # prep/recovery time only warn
+        if not errors:
+            from sh_gen import ScheduleGenerator
+            checker = ScheduleGenerator()
+            checker.load_user_data(self._collect_user_data())
+            report = checker.check_feasibility()
+            errors.extend(report.errors)
+            self.input_warnings.extend(report.warnings)
+            self.input_warnings.extend(f"Overlap on {conflict.describe()}" for conflict in report.conflicts)
         
         return errors
 
     def _time_to_minutes(self, time_str):
         """Helper method to convert time to minutes"""
-        hours, minutes = map(int, time_str.split(':'))
-        return hours * 60 + minutes
+        return clock_to_minutes(time_str)
 
     def run_schedule_generation(self):
         # Validate all inputs first
@@ -432,85 +459,168 @@ class ScheduleApp(ctk.CTk):
             
             self.display_error(error_message)
             return
+        if self.input_warnings and not self._confirm_warnings(self.input_warnings):
+            return
+
+        try:
+            user_data = self._collect_user_data()
+        except ValueError as ve:
+            self.display_error(f"Input Error: {ve}\n\nPlease check your input values and try again.")
+            return
+        except Exception as e:
+            self.display_error(f"Unexpected Error: {e}\n\nPlease check all fields are filled correctly and try again.")
+            return
 
+        # --- Run Backend Logic ---
+        # Supersede any generation still in flight; its results will be ignored
+        if self.generation_cancel is not None:
+            self.generation_cancel.set()
+        self.generation_id += 1
+        self.generation_cancel = threading.Event()
+
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=2, column=0, pady=(0, 10), padx=10, sticky="ew")
+        worker = threading.Thread(
+            target=_generate_in_background,
+            args=(user_data, self.generation_id, self.generation_cancel, self.generation_results,
+                  self.last_scheduler),
+            daemon=True)
+        worker.start()
+        if not self.polling_generation:
+            self.polling_generation = True
+            self.after(POLL_INTERVAL_MS, self._poll_generation)
+
+    def _confirm_warnings(self, warnings):
+        """Ask whether to generate despite the warnings; True to go ahead"""
+        from tkinter import messagebox
+        message = "Your schedule has these problems:\n\n"
+        for i, warning in enumerate(warnings[:10], 1):  # Show max 10 warnings
+            message += f"{i}. {warning}\n"
+        if len(warnings) > 10:
+            message += f"\n... and {len(warnings) - 10} more."
+        return messagebox.askyesno("Check your schedule", message + "\n\nGenerate it anyway?", parent=self)
+
+    def _collect_user_data(self):
+        """Build the user_data profile from the current form values"""
         user_data = {}
         day_map = {'Mon':'Monday', 'Tue':'Tuesday', 'Wed':'Wednesday', 'Thu':'Thursday', 'Fri':'Friday', 'Sat':'Saturday', 'Sun':'Sunday'}
 
-        try:
-            # --- Collect data from GUI ---
-            user_data['sleep_duration'] = float(self.sleep_slider.get())
-            user_data['wake_up_time'] = self._validate_time_format(self.wake_up_entry.get())
-            user_data['cook_dinner'] = bool(self.cook_dinner_check.get())
-            user_data['cooking_time'] = float(self.cooking_time_entry.get() or 0) if user_data['cook_dinner'] else 0
-            user_data['entertainment_hours'] = float(self.entertainment_slider.get())
-            
-            # Process appointments
-            user_data['fixed_classes'] = []
-            active_appointments = [f for f in self.appointment_frames if f["container"].winfo_exists()]
-            for frame in active_appointments:
-                name = frame["name"].get().strip()
-                if name:  # Only add appointments with names
-                    selected_days = [day_map[day] for day, var in frame["days"].items() if var.get()]
-                    if selected_days:  # Only add if at least one day is selected
-                        appointment = {
-                            "name": name,
-                            "days": selected_days,
-                            "start_time": self._validate_time_format(frame["start"].get()),
-                            "end_time": self._validate_time_format(frame["end"].get()),
-                            "prep_time": float(frame["prep"].get() or 0),
-                            "post_time": float(frame["post"].get() or 0)
-                        }
-                        user_data['fixed_classes'].append(appointment)
-            
-            # Process learning goals
-            user_data['learning_goals'] = []
-            active_goals = [f for f in self.goal_frames if f["container"].winfo_exists()]
-            for frame in active_goals:
-                name = frame["name"].get().strip()
-                if name:  # Only add goals with names
-                    goal = {
+        # --- Collect data from GUI ---
+        user_data['sleep_duration'] = float(self.sleep_slider.get())
+        user_data['wake_up_time'] = self._validate_time_format(self.wake_up_entry.get())
+        user_data['cook_dinner'] = bool(self.cook_dinner_check.get())
+        user_data['cooking_time'] = float(self.cooking_time_entry.get() or 0) if user_data['cook_dinner'] else 0
+        user_data['entertainment_hours'] = float(self.entertainment_slider.get())
+        
+        # Process appointments
+        user_data['fixed_classes'] = []
+        active_appointments = [f for f in self.appointment_frames if f["container"].winfo_exists()]
+        for frame in active_appointments:
+            name = frame["name"].get().strip()
+            if name:  # Only add appointments with names
+                selected_days = [day_map[day] for day, var in frame["days"].items() if var.get()]
+                if selected_days:  # Only add if at least one day is selected
+                    appointment = {
                         "name": name,
-                        "weekly_hours": float(frame["hours"].get() or 0),
-                        "priority": int(frame["priority"].get()),
-                        "preferred_time": frame["preferred_time"].get(),
-                        "min_session": float(frame["min_session"].get() or 0.5),
-                        "max_session": float(frame["max_session"].get() or 2.0)
+                        "days": selected_days,
+                        "start_time": self._validate_time_format(frame["start"].get()),
+                        "end_time": self._validate_time_format(frame["end"].get()),
+                        "prep_time": float(frame["prep"].get() or 0),
+                        "post_time": float(frame["post"].get() or 0)
                     }
-                    user_data['learning_goals'].append(goal)
+                    user_data['fixed_classes'].append(appointment)
+        
+        # Process learning goals
+        user_data['learning_goals'] = []
+        active_goals = [f for f in self.goal_frames if f["container"].winfo_exists()]
+        for frame in active_goals:
+            name = frame["name"].get().strip()
+            if name:  # Only add goals with names
+                goal = {
+                    "name": name,
+                    "weekly_hours": float(frame["hours"].get() or 0),
+                    "priority": int(frame["priority"].get()),
+                    "preferred_time": frame["preferred_time"].get(),
+                    "min_session": float(frame["min_session"].get() or 0.5),
+                    "max_session": float(frame["max_session"].get() or 2.0)
+                }
+                user_data['learning_goals'].append(goal)
+
+        return user_data
+
+    def _poll_generation(self):
+        """Deliver worker messages for the current generation; stale ones are dropped"""
+        finished = False
+        try:
+            while True:
+                kind, generation, payload = self.generation_results.get_nowait()
+                if generation != self.generation_id:
+                    continue
+                if kind == 'progress':
+                    self.progress_bar.set(payload)
+                    continue
+                finished = True
+                self.progress_bar.grid_remove()
+                self.generation_cancel = None
+                if kind == 'done':
+                    self.last_scheduler = payload
+                    self.display_schedule_window(payload)
+                elif isinstance(payload, ValueError):
+                    self.display_error(f"Input Error: {payload}\n\nPlease check your input values and try again.")
+                else:
+                    self.display_error(f"Unexpected Error: {payload}\n\nPlease check all fields are filled correctly and try again.")
+        except queue.Empty:
+            pass
 
-            # --- Run Backend Logic ---
-            scheduler = ScheduleGenerator()
-            scheduler.user_data = user_data
-            scheduler.user_data['learning_goals'].sort(key=lambda x: x['priority'], reverse=True)
-            
-            # Initialize and generate schedule
-            scheduler.schedule = {day: [] for day in scheduler.days}
-            scheduler.add_fixed_commitments()
-            scheduler.add_routine_tasks()
-            scheduler.schedule_flexible_tasks(scheduler.user_data['learning_goals'], 'learning')
-            scheduler.schedule_entertainment()
+        if not finished and self.generation_cancel is not None:
+            self.after(POLL_INTERVAL_MS, self._poll_generation)
+        else:
+            self.polling_generation = False
+
+    def open_saved_schedule(self):
+        """Show a schedule saved earlier without regenerating it"""
+        from tkinter import filedialog
+        filename = filedialog.askopenfilename(
+            title="Open Saved Schedule",
+            filetypes=[("Saved schedules", "*.yaml *.yml *.jsonl *.sgb"), ("All files", "*.*")])
+        if not filename:
+            return
+        try:
+            from sh_gen import ScheduleGenerator
+            scheduler = ScheduleGenerator.open_schedule(filename)
+        except Exception as e:
+            self.display_error(f"Could not open {filename}:\n\n{e}")
+            return
+        self.display_schedule_window(scheduler)
+        # Every day has been read for display, so the file can be unmapped
+        close = getattr(scheduler.schedule, 'close', None)
+        if close is not None:
+            close()
+
+    def _show_window(self, window):
+        """Bring a (possibly hidden) secondary window to the front and make it modal"""
+        window.deiconify()
+        window.lift()
+        window.focus_force()
+        
+        try:
+            window.after(100, lambda: window.grab_set())
+        except:
+            pass
 
-            self.display_schedule_window(scheduler)
+    def _hide_window(self, window):
+        """Hide a secondary window so the next message reuses it instead of building a new one"""
+        window.grab_release()
+        window.withdraw()
 
-        except ValueError as ve:
-            self.display_error(f"Input Error: {ve}\n\nPlease check your input values and try again.")
-        except Exception as e:
-            self.display_error(f"Unexpected Error: {e}\n\nPlease check all fields are filled correctly and try again.")
+    def _build_schedule_window(self):
+        from sh_view import ScheduleView
 
-    def display_schedule_window(self, scheduler):
         schedule_window = ctk.CTkToplevel(self)
         schedule_window.title("Your Generated Schedule")
         schedule_window.geometry("800x700")
         schedule_window.transient(self)
-        
-        schedule_window.deiconify()
-        schedule_window.lift()
-        schedule_window.focus_force()
-        
-        try:
-            schedule_window.after(100, lambda: schedule_window.grab_set())
-        except:
-            pass
+        schedule_window.protocol("WM_DELETE_WINDOW", lambda: self._hide_window(schedule_window))
 
         main_frame = ctk.CTkFrame(schedule_window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -519,109 +629,61 @@ class ScheduleApp(ctk.CTk):
                                  font=("Arial", 20, "bold"))
         title_label.pack(pady=(10, 20))
 
-        output_text = ""
-        total_scheduled_hours = {goal['name']: 0 for goal in scheduler.user_data['learning_goals']}
-        
-        for day in scheduler.days:
-            output_text += f"\n{'='*50}\n"
-            output_text += f"{day.upper():^50}\n"
-            output_text += f"{'='*50}\n"
-            
-            day_schedule = sorted(scheduler.schedule.get(day, []), key=lambda x: scheduler.time_to_minutes(x['start']))
-
-            if not day_schedule:
-                output_text += "No activities scheduled.\n"
-            else:
-                for item in day_schedule:
-                    # Skip duplicate sleep entries
-                    if item.get('task') == 'Sleep' and item.get('start') == '00:00':
-                        continue
-                    
-                    start_time = item.get('start', '')
-                    end_time = item.get('end', '')
-                    task_name = item.get('task', '')
-                    
-                    # Calculate duration for learning goals
-                    if item.get('type') == 'learning':
-                        try:
-                            start_mins = scheduler.time_to_minutes(start_time)
-                            end_mins = scheduler.time_to_minutes(end_time)
-                            duration_hours = (end_mins - start_mins) / 60
-                            total_scheduled_hours[task_name] += duration_hours
-                        except:
-                            pass
-                    
-                    output_text += f"{start_time:>5} - {end_time:<5} │ {task_name}\n"
-
-        output_text += f"\n\n{'='*50}\n"
-        output_text += f"{'WEEKLY SUMMARY':^50}\n"
-        output_text += f"{'='*50}\n"
-        
-        output_text += f"Sleep: {scheduler.user_data['sleep_duration']} hours/night\n"
-        output_text += f"Entertainment: {scheduler.user_data['entertainment_hours']} hours/week\n"
-        if scheduler.user_data['cook_dinner']:
-            output_text += f"Cooking: {scheduler.user_data['cooking_time']} hours/day\n"
-        
-        output_text += f"\nLEARNING GOALS PROGRESS:\n"
-        output_text += f"{'-'*30}\n"
-        for goal in scheduler.user_data['learning_goals']:
-            target = goal['weekly_hours']
-            scheduled = total_scheduled_hours.get(goal['name'], 0)
-            percentage = (scheduled / target * 100) if target > 0 else 0
-            output_text += f"{goal['name']}: {scheduled:.1f}h / {target:.1f}h ({percentage:.0f}%)\n"
-
-        schedule_textbox = ctk.CTkTextbox(main_frame, font=("Courier New", 12), wrap="word")
-        schedule_textbox.pack(expand=True, fill="both", padx=10, pady=10)
-        schedule_textbox.insert("0.0", output_text)
-        schedule_textbox.configure(state="disabled")
+        # Only the lines in view are drawn, so long schedules open and scroll at once
+        self.schedule_view = ScheduleView(main_frame)
+        self.schedule_view.pack(expand=True, fill="both", padx=10, pady=10)
 
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
         buttons_frame.pack(fill="x", pady=10)
 
-        def save_and_notify():
-            try:
-                scheduler.save_schedule()
-                messagebox.showinfo("Success", "Schedule has been saved to 'my_schedule.yaml' successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save schedule: {e}")
-
-        def export_to_text():
-            try:
-                with open("my_schedule.txt", "w", encoding="utf-8") as f:
-                    f.write(output_text)
-                messagebox.showinfo("Success", "Schedule exported to 'my_schedule.txt' successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export schedule: {e}")
-
-        save_button = ctk.CTkButton(buttons_frame, text="💾 Save YAML", command=save_and_notify)
+        save_button = ctk.CTkButton(buttons_frame, text="💾 Save YAML", command=self.save_shown_schedule)
         save_button.pack(side="left", padx=(0, 10))
 
-        export_button = ctk.CTkButton(buttons_frame, text="📄 Export Text", command=export_to_text)
+        export_button = ctk.CTkButton(buttons_frame, text="📄 Export Text", command=self.export_shown_schedule)
         export_button.pack(side="left", padx=10)
 
-        close_button = ctk.CTkButton(buttons_frame, text="✖ Close", command=schedule_window.destroy)
+        close_button = ctk.CTkButton(buttons_frame, text="✖ Close",
+                                     command=lambda: self._hide_window(schedule_window))
         close_button.pack(side="right")
+        return schedule_window
 
-    def display_error(self, message):
+    def display_schedule_window(self, scheduler):
+        # Built on first use, then reused; the view only re-lays out days that changed
+        if self.schedule_window is None or not self.schedule_window.winfo_exists():
+            self.schedule_window = self._build_schedule_window()
+        self.shown_scheduler = scheduler
+        self.schedule_view.show(scheduler)
+        self._show_window(self.schedule_window)
+
+    def save_shown_schedule(self):
+        from tkinter import messagebox
+        try:
+            self.shown_scheduler.save_schedule()
+            messagebox.showinfo("Success", "Schedule has been saved to 'my_schedule.yaml' successfully!")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save schedule: {e}")
+
+    def export_shown_schedule(self):
+        from tkinter import messagebox
+        from sh_view import schedule_text
+        try:
+            with open("my_schedule.txt", "w", encoding="utf-8") as f:
+                f.write(schedule_text(self.shown_scheduler))
+            messagebox.showinfo("Success", "Schedule exported to 'my_schedule.txt' successfully!")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export schedule: {e}")
+
+    def _build_error_window(self):
         error_window = ctk.CTkToplevel(self)
         error_window.title("Input Validation Error")
         error_window.geometry("500x400")
         error_window.transient(self)
+        error_window.protocol("WM_DELETE_WINDOW", lambda: self._hide_window(error_window))
         
         error_window.update_idletasks()
         x = (error_window.winfo_screenwidth() // 2) - (500 // 2)
         y = (error_window.winfo_screenheight() // 2) - (400 // 2)
         error_window.geometry(f"500x400+{x}+{y}")
-        
-        error_window.deiconify()
-        error_window.lift()
-        error_window.focus_force()
-        
-        # Set grab after window is fully visible
-        try:
-            error_window.after(100, lambda: error_window.grab_set())
-        except:
-            pass
 
         main_frame = ctk.CTkFrame(error_window)
         main_frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -633,14 +695,22 @@ class ScheduleApp(ctk.CTk):
                                  font=("Arial", 18, "bold"), text_color="#FF6B6B")
         error_label.pack()
 
-        error_textbox = ctk.CTkTextbox(main_frame, font=("Arial", 12), wrap="word")
-        error_textbox.pack(expand=True, fill="both", pady=(0, 20))
-        error_textbox.insert("0.0", message)
-        error_textbox.configure(state="disabled")
+        self.error_textbox = ctk.CTkTextbox(main_frame, font=("Arial", 12), wrap="word")
+        self.error_textbox.pack(expand=True, fill="both", pady=(0, 20))
 
         ok_button = ctk.CTkButton(main_frame, text="OK, I'll Fix These", 
-                                command=error_window.destroy, width=200, height=40)
+                                command=lambda: self._hide_window(error_window), width=200, height=40)
         ok_button.pack()
+        return error_window
+
+    def display_error(self, message):
+        if self.error_window is None or not self.error_window.winfo_exists():
+            self.error_window = self._build_error_window()
+        self.error_textbox.configure(state="normal")
+        self.error_textbox.delete("0.0", "end")
+        self.error_textbox.insert("0.0", message)
+        self.error_textbox.configure(state="disabled")
+        self._show_window(self.error_window)
 
 if __name__ == "__main__":
     app = ScheduleApp()
@@ -0,0 +1,495 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+from sh_gen import DEFAULT_STRATEGY, ScheduleEntry, ScheduleGenerator
+from sh_time import clock_to_minutes
+
+# PyYAML is imported by _require_yaml on first use, so JSONL and binary files never load it
+yaml = None
+YamlDumper = YamlLoader = None
+
+FORMATS = {
+    'yaml': ('.yaml', '.yml'),
+    'jsonl': ('.jsonl',),
+    'binary': ('.sgb',),
+}
+
+BINARY_MAGIC = b'SGB1'
+# u64 offset of the footer, then the magic again, at the very end of a binary file
+BINARY_TRAILER = struct.Struct('<Q4s')
+BINARY_U32 = struct.Struct('<I')
+
+def format_for(filename, fmt=None):
+    """Pick the output format from an explicit name or the file extension (YAML by default)"""
+    if fmt is not None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown schedule format: {fmt}")
+        return fmt
+    ext = os.path.splitext(filename)[1].lower()
+    for name, extensions in FORMATS.items():
+        if ext in extensions:
+            return name
+    return 'yaml'
+
+
+def save(scheduler, filename, fmt=None):
+    """Stream the scheduler's user_data and schedule to filename.
+
+    The file is written beside the target and renamed over it, so a
+    schedule opened lazily from filename keeps reading the old contents.
+    """
+    fmt = format_for(filename, fmt)
+    fd, tmp = _create_beside(filename)
+    try:
+        if fmt == 'binary':
+            with os.fdopen(fd, 'wb') as f:
+                _write_binary(scheduler, f)
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                (_write_yaml if fmt == 'yaml' else _write_jsonl)(scheduler, f)
+        # A file being replaced keeps its mode; a new one has the umask applied, as with open()
+        try:
+            os.chmod(tmp, os.stat(filename).st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _create_beside(filename):
+    """Create a new temporary file in filename's directory; return its descriptor and path"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    while True:
+        tmp = os.path.join(directory, f"{os.path.basename(filename)}.{os.urandom(4).hex()}.tmp")
+        try:
+            # The kernel applies the umask to 0o666, as it does for open()
+            return os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def load(filename, fmt=None, strategy=DEFAULT_STRATEGY):
+    """Rebuild a ScheduleGenerator from a saved file without re-running generation"""
+    fmt = format_for(filename, fmt)
+    if fmt == 'binary':
+        with open(filename, 'rb') as f:
+            user_data, schedule = _read_binary(f)
+    elif fmt == 'jsonl':
+        with open(filename, encoding='utf-8') as f:
+            user_data, schedule = _read_jsonl(f)
+    else:
+        _require_yaml()
+        with open(filename, encoding='utf-8') as f:
+            data = yaml.load(f, Loader=YamlLoader) or {}
+        user_data = data.get('user_data', {})
+        schedule = {day: [entry_from_dict(item) for item in items or []]
+                    for day, items in (data.get('schedule') or {}).items()}
+    return restore(user_data, schedule, strategy)
+
+
+def restore(user_data, schedule, strategy=DEFAULT_STRATEGY):
+    """Build a generator around already-generated data, re-linking entries to their sources"""
+    scheduler = ScheduleGenerator(strategy)
+    scheduler.user_data = user_data
+    for day, entries in schedule.items():
+        scheduler.schedule[day] = entries
+    relink_sources(scheduler)
+    return scheduler
+
+
+def relink_sources(scheduler):
+    """Point entries back at the fixed_classes and learning_goals items they came from"""
+    for day, items in scheduler.schedule.items():
+        relink_day(scheduler.user_data, day, items)
+
+
+def relink_day(user_data, day, items):
+    goals = {goal['name']: goal for goal in user_data.get('learning_goals', [])}
+    classes = {}
+    for class_info in user_data.get('fixed_classes', []):
+        if day in class_info['days']:
+            for task in (class_info['name'], f"{class_info['name']} - Preparation",
+                         f"{class_info['name']} - Recovery"):
+                classes.setdefault(task, class_info)
+    for item in items:
+        if item.type == 'learning':
+            item.source = goals.get(item.task)
+        elif item.type == 'fixed' and item.source is None:
+            item.source = classes.get(item.task)
+
+
+def entry_from_dict(item):
+    return ScheduleEntry(item['task'], clock_to_minutes(item['start']), clock_to_minutes(item['end']), item['type'])
+
+
+def _require_yaml():
+    global yaml, YamlDumper, YamlLoader
+    if yaml is None:
+        try:
+            import yaml as module
+        except ImportError:
+            raise ImportError("The YAML format requires PyYAML (pip install pyyaml)") from None
+        # libyaml bindings are many times faster than the pure-Python dumper and loader
+        YamlDumper = getattr(module, 'CSafeDumper', module.SafeDumper)
+        YamlLoader = getattr(module, 'CSafeLoader', module.SafeLoader)
+        yaml = module
+
+
+# --- YAML ---
+
+def _indent(text, prefix='  '):
+    return ''.join(prefix + line for line in text.splitlines(True))
+
+
+def _write_yaml(scheduler, f):
+    """Write the same document as yaml.dump(scheduler.to_dict()), one entry at a time"""
+    _require_yaml()
+    rendered = {}
+    f.write('schedule:\n')
+    for day in sorted(scheduler.schedule):
+        items = scheduler.schedule[day]
+        if not items:
+            f.write(f"  {day}: []\n")
+            continue
+        f.write(f"  {day}:\n")
+        for item in items:
+            key = (item.task, item.start_min, item.end_min, item.type)
+            text = rendered.get(key)
+            if text is None:
+                # Sleep, meals and classes repeat every day, so most entries render once
+                text = _indent(yaml.dump([item.to_dict()], Dumper=YamlDumper, default_flow_style=False))
+                rendered[key] = text
+            f.write(text)
+    if scheduler.user_data:
+        f.write('user_data:\n')
+        f.write(_indent(yaml.dump(scheduler.user_data, Dumper=YamlDumper, default_flow_style=False)))
+    else:
+        f.write('user_data: {}\n')
+
+
+# --- JSON Lines: a user_data line, then one line per entry ---
+
+def _write_jsonl(scheduler, f):
+    f.write(json.dumps({'user_data': scheduler.user_data, 'days': list(scheduler.schedule)}) + '\n')
+    for day, items in scheduler.schedule.items():
+        for item in items:
+            f.write(json.dumps({'day': day, **item.to_dict()}) + '\n')
+
+
+def _read_jsonl(f):
+    header = json.loads(f.readline())
+    schedule = {day: [] for day in header.get('days', [])}
+    for line in f:
+        if line.strip():
+            item = json.loads(line)
+            schedule.setdefault(item['day'], []).append(entry_from_dict(item))
+    return header['user_data'], schedule
+
+
+# --- Binary columnar ---
+#
+# MAGIC | u32 length + JSON header {user_data}
+#       | per day: u32 count, int16 starts[count], int16 ends[count], u32 task ids[count], u8 type ids[count]
+#       | footer JSON {days: {day: [offset, count]}, tasks: [...], types: [...]}
+#       | u64 footer offset | MAGIC
+# Starts and ends are minutes since midnight; task and type ids index the footer's name tables.
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _write_binary(scheduler, f):
+    header = json.dumps({'user_data': scheduler.user_data}).encode('utf-8')
+    f.write(BINARY_MAGIC)
+    f.write(BINARY_U32.pack(len(header)))
+    f.write(header)
+
+    tables = {'tasks': ([], {}), 'types': ([], {})}
+    days = {}
+
+    def string_id(table, text):
+        names, ids = tables[table]
+        if text not in ids:
+            ids[text] = len(names)
+            names.append(text)
+        return ids[text]
+
+    for day, items in scheduler.schedule.items():
+        days[day] = [f.tell(), len(items)]
+        f.write(BINARY_U32.pack(len(items)))
+        f.write(_little_endian(array('h', [item.start_min for item in items])))
+        f.write(_little_endian(array('h', [item.end_min for item in items])))
+        f.write(_little_endian(array('I', [string_id('tasks', item.task) for item in items])))
+        f.write(_little_endian(array('B', [string_id('types', item.type) for item in items])))
+
+    footer_offset = f.tell()
+    footer = {'days': days, 'tasks': tables['tasks'][0], 'types': tables['types'][0]}
+    f.write(json.dumps(footer).encode('utf-8'))
+    f.write(BINARY_TRAILER.pack(footer_offset, BINARY_MAGIC))
+
+
+def _read_array(typecode, data, offset, count):
+    values = array(typecode)
+    end = offset + values.itemsize * count
+    values.frombytes(data[offset:end])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values, end
+
+
+def read_binary_footer(data):
+    """Return the footer (day offsets and name tables) from the bytes or mmap of a binary schedule"""
+    if data[:4] != BINARY_MAGIC or data[-4:] != BINARY_MAGIC:
+        raise ValueError("Not a binary schedule file")
+    footer_offset, _ = BINARY_TRAILER.unpack(data[-BINARY_TRAILER.size:])
+    return json.loads(bytes(data[footer_offset:len(data) - BINARY_TRAILER.size]))
+
+
+def read_binary_header(data):
+    """Return the header (user_data) from the bytes or mmap of a binary schedule"""
+    (length,) = BINARY_U32.unpack(data[4:8])
+    return json.loads(bytes(data[8:8 + length]))
+
+
+def read_binary_day(data, offset, footer):
+    """Decode a single day's columns starting at offset"""
+    (count,) = BINARY_U32.unpack(data[offset:offset + 4])
+    starts, offset = _read_array('h', data, offset + 4, count)
+    ends, offset = _read_array('h', data, offset, count)
+    tasks, offset = _read_array('I', data, offset, count)
+    types, offset = _read_array('B', data, offset, count)
+    task_names, type_names = footer['tasks'], footer['types']
+    return [ScheduleEntry(task_names[task], start, end, type_names[kind])
+            for start, end, task, kind in zip(starts, ends, tasks, types)]
+
+
+def _read_binary(f):
+    data = f.read()
+    footer = read_binary_footer(data)
+    schedule = {day: read_binary_day(data, offset, footer) for day, (offset, _) in footer['days'].items()}
+    return read_binary_header(data)['user_data'], schedule
+
+
+# --- Lazy, per-day access ---
+
+class LazySchedule(MutableMapping):
+    """day -> entries mapping that decodes a day from the file the first time it is read"""
+
+    def __init__(self, days, load_day, release=None):
+        self._days = list(days)
+        self._load_day = load_day
+        self._loaded = {}
+        # Frees the underlying file map; called by close
+        self._release = release
+
+    def close(self):
+        """Decode the days not read yet, then release the file; the mapping stays usable"""
+        for day in self._days:
+            self[day]
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+    def __getitem__(self, day):
+        if day not in self._loaded:
+            if day not in self._days:
+                raise KeyError(day)
+            self._loaded[day] = self._load_day(day)
+        return self._loaded[day]
+
+    def __setitem__(self, day, entries):
+        if day not in self._days:
+            self._days.append(day)
+        self._loaded[day] = entries
+
+    def __delitem__(self, day):
+        self._days.remove(day)
+        self._loaded.pop(day, None)
+
+    def __iter__(self):
+        return iter(self._days)
+
+    def __len__(self):
+        return len(self._days)
+
+    def loaded_days(self):
+        """Days parsed so far"""
+        return [day for day in self._days if day in self._loaded]
+
+
+def _map_file(filename):
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _index_yaml(data):
+    """Byte ranges of each day and of user_data in a file laid out like save_schedule's YAML"""
+    if data[:len(b'schedule:\n')] != b'schedule:\n':
+        return None
+    user_data_at = data.find(b'\nuser_data:')
+    if user_data_at < 0:
+        return None
+    sections, position = [], len(b'schedule:\n')
+    # Day keys are the only lines indented by exactly two spaces with no list marker
+    while position <= user_data_at:
+        line_end = data.find(b'\n', position)
+        line = data[position:line_end]
+        if line.startswith(b'  ') and not line.startswith(b'   ') and not line.startswith(b'  -'):
+            sections.append((line[2:].split(b':', 1)[0].decode('utf-8'), position))
+        position = line_end + 1
+    ranges = {}
+    for i, (day, start) in enumerate(sections):
+        end = sections[i + 1][1] if i + 1 < len(sections) else user_data_at + 1
+        ranges[day] = (start, end)
+    return ranges, user_data_at + 1
+
+
+def _index_jsonl(data):
+    """Byte range of each day's contiguous run of entry lines"""
+    header_end = data.find(b'\n') + 1
+    ranges, position = {}, header_end
+    prefix = b'{"day": "'
+    while position < len(data):
+        line_end = data.find(b'\n', position)
+        line_end = len(data) if line_end < 0 else line_end
+        if data[position:position + len(prefix)] == prefix:
+            day_end = data.find(b'"', position + len(prefix))
+            day = data[position + len(prefix):day_end].decode('utf-8')
+            start, _ = ranges.get(day, (position, None))
+            ranges[day] = (start, line_end + 1)
+        position = line_end + 1
+    return header_end, ranges
+
+
+def open_schedule(filename, fmt=None, strategy=DEFAULT_STRATEGY):
+    """Open a saved schedule with only its index read; each day is parsed when first accessed.
+
+    Binary files are memory-mapped and decoded per day. YAML and JSON Lines
+    files written by save_schedule are indexed by a byte scan, and only the
+    requested day's section is parsed. YAML laid out any other way is loaded
+    in full. The file stays mapped until scheduler.schedule.close() (when
+    the schedule is a LazySchedule) reads the remaining days and unmaps it.
+    """
+    fmt = format_for(filename, fmt)
+    data = _map_file(filename)
+    scheduler = ScheduleGenerator(strategy)
+
+    if fmt == 'binary':
+        footer = read_binary_footer(data)
+        user_data = read_binary_header(data)['user_data']
+        offsets = {day: offset for day, (offset, _) in footer['days'].items()}
+
+        def decode(day):
+            return read_binary_day(data, offsets[day], footer) if day in offsets else []
+        days = list(offsets)
+    elif fmt == 'jsonl':
+        header_end, ranges = _index_jsonl(data)
+        header = json.loads(bytes(data[:header_end]))
+        user_data = header['user_data']
+
+        def decode(day):
+            if day not in ranges:
+                return []
+            start, end = ranges[day]
+            return [entry_from_dict(json.loads(line)) for line in bytes(data[start:end]).splitlines() if line.strip()]
+        days = header.get('days') or list(ranges)
+    else:
+        _require_yaml()
+        index = _index_yaml(data)
+        if index is None:
+            if isinstance(data, mmap.mmap):
+                data.close()
+            return load(filename, fmt, strategy)
+        ranges, user_data_at = index
+        user_data = (yaml.load(bytes(data[user_data_at:]), Loader=YamlLoader) or {}).get('user_data') or {}
+
+        def decode(day):
+            if day not in ranges:
+                return []
+            start, end = ranges[day]
+            items = (yaml.load(bytes(data[start:end]), Loader=YamlLoader) or {}).get(day) or []
+            return [entry_from_dict(item) for item in items]
+        days = list(ranges)
+
+    def load_day(day):
+        entries = decode(day)
+        relink_day(user_data, day, entries)
+        return entries
+
+    scheduler.user_data = user_data
+    scheduler.schedule = LazySchedule(
+        scheduler.days + [day for day in days if day not in scheduler.days], load_day,
+        data.close if isinstance(data, mmap.mmap) else None)
+    return scheduler
+
+
+class ScheduleArchive:
+    """Random access to a multi-profile JSONL archive such as sh_batch output.
+
+    Only line offsets are indexed up front (a byte scan of the memory-mapped
+    file); a profile is parsed when it is asked for.
+    """
+
+    def __init__(self, filename):
+        self.data = _map_file(filename)
+        self.offsets = []
+        position = 0
+        while position < len(self.data):
+            line_end = self.data.find(b'\n', position)
+            line_end = len(self.data) if line_end < 0 else line_end
+            if line_end > position:
+                self.offsets.append((position, line_end))
+            position = line_end + 1
+        self._ids = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def record(self, index):
+        """The full result record of the profile at index"""
+        start, end = self.offsets[index]
+        return json.loads(bytes(self.data[start:end]))
+
+    def ids(self):
+        """Profile ids in archive order, read from the start of each line"""
+        if self._ids is None:
+            decoder = json.JSONDecoder()
+            prefix = b'{"id":'
+            self._ids = []
+            for start, end in self.offsets:
+                head = bytes(self.data[start:min(end, start + 256)])
+                if head.startswith(prefix):
+                    try:
+                        self._ids.append(decoder.raw_decode(head[len(prefix):].decode('utf-8', 'ignore'))[0])
+                        continue
+                    except ValueError:
+                        pass
+                self._ids.append(self.record(len(self._ids)).get('id'))
+        return self._ids
+
+    def find(self, profile_id):
+        return self.ids().index(profile_id)
+
+    def generator(self, index, strategy=DEFAULT_STRATEGY):
+        """A ScheduleGenerator for one archived profile, ready for display_schedule_window"""
+        data = self.record(index)
+        if 'error' in data:
+            raise ValueError(f"Profile {data.get('id')} failed: {data['error']}")
+        schedule = {day: [entry_from_dict(item) for item in items] for day, items in data['schedule'].items()}
+        return restore(data['user_data'], schedule, strategy)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
@@ -0,0 +1,158 @@
+from sh_time import MINUTES_PER_DAY, parse_time
+
+try:
+    import numpy as np
+except ImportError:  # The vectorized backend is optional
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The occupancy backend requires NumPy (pip install numpy)")
+
+
+def _waking_window(user_data):
+    """Waking minutes of a day as used by get_available_slots, clipped to midnight"""
+    wake = parse_time(user_data['wake_up_time'])
+    end_of_day = wake + MINUTES_PER_DAY - user_data['sleep_duration'] * 60
+    return wake, int(min(end_of_day, MINUTES_PER_DAY))
+
+
+def _count_coverage(profile_count, profile_idx, day_idx, starts, ends):
+    """Turn entry intervals into per-minute coverage counts with a difference array.
+
+    Intervals are laid on the 7 * 1440 minute-of-week axis, so time before or
+    after midnight counts on the neighbouring day, wrapping around the week.
+    """
+    week = 7 * MINUTES_PER_DAY
+    starts = np.asarray(day_idx, dtype=np.int64) * MINUTES_PER_DAY + np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(day_idx, dtype=np.int64) * MINUTES_PER_DAY + np.asarray(ends, dtype=np.int64)
+    keep = ends > starts
+    profile_idx, starts, ends = profile_idx[keep], starts[keep], ends[keep]
+    shift = np.floor_divide(starts, week) * week
+    starts, ends = starts - shift, np.minimum(ends - shift, starts - shift + week)
+    # The part of an interval past Sunday midnight continues on Monday morning
+    wraps = ends > week
+    profile_idx = np.concatenate([profile_idx, profile_idx[wraps]])
+    starts = np.concatenate([starts, np.zeros(int(wraps.sum()), dtype=np.int64)])
+    ends = np.concatenate([np.minimum(ends, week), ends[wraps] - week])
+    diff = np.zeros((profile_count, week + 1), dtype=np.int32)
+    np.add.at(diff, (profile_idx, starts), 1)
+    np.add.at(diff, (profile_idx, ends), -1)
+    counts = np.cumsum(diff, axis=-1)[..., :week].astype(np.int16)
+    return counts.reshape(profile_count, 7, MINUTES_PER_DAY)
+
+
+def _collect_entries(schedules, days, types):
+    profile_idx, day_idx, starts, ends = [], [], [], []
+    for p, schedule in enumerate(schedules):
+        for d, day in enumerate(days):
+            for item in schedule[day]:
+                if types is None or item.type in types:
+                    profile_idx.append(p)
+                    day_idx.append(d)
+                    starts.append(item.start_min)
+                    ends.append(item.end_min)
+    return (np.asarray(profile_idx, dtype=np.int64), np.asarray(day_idx, dtype=np.int64),
+            np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64))
+
+
+class BatchOccupancy:
+    """profiles x 7 x 1440 array counting how many entries cover each minute
+
+    Minute-resolution counterpart of the per-day slot index: free time,
+    overlaps and utilization for every profile in a batch come out of single
+    array operations. Entries sit on the minute-of-week axis, so time after
+    midnight is carried into the next morning.
+    """
+
+    def __init__(self, counts, windows=None):
+        _require_numpy()
+        self.counts = counts
+        # (profiles, 2) waking [start, end) per profile; minutes outside it are never free
+        if windows is None:
+            windows = np.tile([0, MINUTES_PER_DAY], (counts.shape[0], 1))
+        self.windows = np.asarray(windows, dtype=np.int64)
+
+    @classmethod
+    def from_schedulers(cls, schedulers, types=('fixed',)):
+        """Stack the occupancy of several generated schedules; types=None counts every entry"""
+        schedulers = list(schedulers)
+        days = schedulers[0].days if schedulers else []
+        return cls.from_schedules([scheduler.schedule for scheduler in schedulers],
+                                  [scheduler.user_data for scheduler in schedulers], days, types)
+
+    @classmethod
+    def from_schedules(cls, schedules, user_data, days, types=('fixed',)):
+        """Stack {day: entries} schedules, each with the user_data it was generated from"""
+        _require_numpy()
+        schedules = list(schedules)
+        counts = _count_coverage(len(schedules), *_collect_entries(schedules, days, types))
+        windows = [_waking_window(data) for data in user_data]
+        return cls(counts, windows)
+
+    def __len__(self):
+        return self.counts.shape[0]
+
+    def __getitem__(self, profile):
+        """The single-profile 7 x 1440 view"""
+        return WeekOccupancy(self.counts[profile:profile + 1], self.windows[profile:profile + 1])
+
+    def _awake_mask(self):
+        minutes = np.arange(MINUTES_PER_DAY)
+        awake = (minutes >= self.windows[:, :1]) & (minutes < self.windows[:, 1:])
+        return awake[:, None, :]
+
+    def _free_mask(self):
+        return (self.counts == 0) & self._awake_mask()
+
+    def free_slots(self, min_length=1):
+        """Every free run as parallel arrays (profile, day, start, end), in row order"""
+        free = self._free_mask().astype(np.int8)
+        pad = np.zeros(free.shape[:-1] + (1,), dtype=np.int8)
+        edges = np.diff(np.concatenate([pad, free, pad], axis=-1), axis=-1)
+        profile, day, start = np.nonzero(edges == 1)
+        end = np.nonzero(edges == -1)[2]
+        keep = end - start >= min_length
+        return profile[keep], day[keep], start[keep], end[keep]
+
+    def busy_minutes(self):
+        """(profiles, 7) minutes covered by at least one entry"""
+        return (self.counts > 0).sum(axis=-1)
+
+    def overlap_minutes(self):
+        """(profiles, 7) minutes covered by two or more entries at once"""
+        return (self.counts > 1).sum(axis=-1)
+
+    def utilization(self):
+        """(profiles, 7) share of each day's waking window that is busy"""
+        window = np.maximum(self.windows[:, 1] - self.windows[:, 0], 1)
+        awake_busy = ((self.counts > 0) & self._awake_mask()).sum(axis=-1)
+        return awake_busy / window[:, None]
+
+
+class WeekOccupancy(BatchOccupancy):
+    """7 x 1440 occupancy of a single profile"""
+
+    @classmethod
+    def from_scheduler(cls, scheduler, types=('fixed',)):
+        return cls.from_schedulers([scheduler], types)
+
+    def free_slots(self, min_length=1, day=None):
+        """Free runs as {day_index: [(start, end)]}, or just the list for one day index"""
+        _, days, starts, ends = super().free_slots(min_length)
+        if day is not None:
+            return [(int(s), int(e)) for d, s, e in zip(days, starts, ends) if d == day]
+        slots = {d: [] for d in range(7)}
+        for d, s, e in zip(days, starts, ends):
+            slots[int(d)].append((int(s), int(e)))
+        return slots
+
+    def busy_minutes(self):
+        return super().busy_minutes()[0]
+
+    def overlap_minutes(self):
+        return super().overlap_minutes()[0]
+
+    def utilization(self):
+        return super().utilization()[0]
@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from sh_batch import process_profile
+from sh_cache import FixedLayoutCache, ResultCache, canonical_key
+from sh_gen import ALLOCATION_STRATEGIES, DEFAULT_STRATEGY, ScheduleGenerator
+
+MAX_BODY_BYTES = 1024 * 1024
+# Connections idle longer than this between requests are closed
+KEEPALIVE_TIMEOUT = 15.0
+
+# Each worker process keeps one generator per strategy and reuses it
+_worker_schedulers = {}
+_worker_layouts = None
+
+
+def _init_worker(layout_cache):
+    global _worker_layouts
+    _worker_layouts = FixedLayoutCache() if layout_cache else None
+
+
+def _generate(text, strategy):
+    """Worker side: one profile in, the encoded response body and whether it failed out"""
+    scheduler = _worker_schedulers.get(strategy)
+    if scheduler is None:
+        scheduler = _worker_schedulers[strategy] = ScheduleGenerator(strategy)
+        scheduler.layout_cache = _worker_layouts
+    result = process_profile('request', text, 'json', scheduler)
+    result.pop('id')
+    return json.dumps(result, separators=(',', ':')).encode('utf-8'), 'error' in result
+
+
+class ServerStats:
+    """Request counters reported by GET /stats"""
+
+    def __init__(self):
+        self.requests = 0
+        self.generated = 0
+        self.coalesced = 0
+        self.cached = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+class ScheduleServer:
+    """HTTP/JSON front end to ScheduleGenerator.
+
+    POST /schedule takes a user_data profile (or a saved file's
+    {'user_data': ...}) and returns {'schedule': ..., 'user_data': ...}, with
+    ?strategy= choosing the allocation strategy. Generation runs in a bounded
+    executor. Concurrent requests for the same profile share one generation,
+    and once max_pending generations are queued new ones get 503 with
+    Retry-After instead of piling up. With a cache (an encoded
+    sh_cache.ResultCache), profiles answered before are served from it, and
+    workers reuse the fixed layout of timetables they have already seen.
+    """
+
+    def __init__(self, workers=None, max_pending=256, strategy=DEFAULT_STRATEGY, executor=None, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.strategy = strategy
+        self.executor = executor
+        self.cache = cache
+        self.stats = ServerStats()
+        # profile key -> future of the generation every identical request awaits
+        self.in_flight = {}
+        self._server = None
+        self._connections = set()
+
+    async def start(self, host='127.0.0.1', port=8765):
+        if self.executor is None:
+            # Forked workers would inherit whichever sockets are open when the pool first grows,
+            # keeping clients from ever seeing EOF, so they are started from a clean process
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(self.cache is not None,),
+                                                mp_context=multiprocessing.get_context(method))
+        self._server = await asyncio.start_server(self.handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold wait_closed open
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEPALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                if body is None and not (headers.get('content-length') or '0').isdigit():
+                    status, payload, extra = HTTPStatus.BAD_REQUEST, self._error("Invalid Content-Length"), {}
+                else:
+                    status, payload, extra = await self.dispatch(method, target, body)
+                # An unread body would be parsed as the next request, so such connections end here
+                keep_alive = body is not None and headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, extra, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Parse one request; None when the client closed the connection or sent garbage.
+
+        The body is None when it was not read (too large, or a Content-Length
+        that is not a number), and the connection must then be closed.
+        """
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split()
+        except ValueError:
+            return None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get('content-length') or '0'
+        if not length.isdigit():
+            return method, target, headers, None
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            return method, target, headers, None
+        body = await reader.readexactly(length) if length else b''
+        return method, target, headers, body
+
+    async def dispatch(self, method, target, body):
+        """Return (status, encoded JSON body, extra headers) for one request"""
+        url = urlsplit(target)
+        if url.path == '/health' and method == 'GET':
+            return HTTPStatus.OK, b'{"status":"ok"}', {}
+        if url.path == '/stats' and method == 'GET':
+            return HTTPStatus.OK, json.dumps(self.stats.to_dict()).encode('utf-8'), {}
+        if url.path != '/schedule':
+            return HTTPStatus.NOT_FOUND, self._error("Not found"), {}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, self._error("Use POST"), {'Allow': 'POST'}
+
+        self.stats.requests += 1
+        if body is None:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, self._error("Profile too large"), {}
+        strategy = parse_qs(url.query).get('strategy', [self.strategy])[0]
+        if strategy != 'greedy' and strategy not in ALLOCATION_STRATEGIES:
+            return HTTPStatus.BAD_REQUEST, self._error(f"Unknown allocation strategy: {strategy}"), {}
+        try:
+            user_data = json.loads(body)
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, self._error(f"Invalid JSON: {e}"), {}
+        if not isinstance(user_data, dict):
+            return HTTPStatus.BAD_REQUEST, self._error("Profile must be a mapping of user_data fields"), {}
+
+        key = canonical_key(user_data, strategy)
+        if self.cache is not None:
+            payload = self.cache.get(key)
+            if payload is not None:
+                self.stats.cached += 1
+                return HTTPStatus.OK, payload, {}
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+        elif len(self.in_flight) >= self.max_pending:
+            self.stats.rejected += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, self._error("Server busy, retry shortly"), {'Retry-After': '1'}
+        else:
+            future = self._submit(key, body.decode('utf-8'), strategy)
+
+        try:
+            # Shielded so one client disconnecting does not cancel a generation others await
+            payload, failed = await asyncio.shield(future)
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, self._error(f"{type(e).__name__}: {e}"), {}
+        return (HTTPStatus.UNPROCESSABLE_ENTITY if failed else HTTPStatus.OK), payload, {}
+
+    def _submit(self, key, text, strategy):
+        loop = asyncio.get_running_loop()
+        future = asyncio.ensure_future(loop.run_in_executor(self.executor, _generate, text, strategy))
+        self.in_flight[key] = future
+        self.stats.generated += 1
+
+        def finished(done):
+            self.in_flight.pop(key, None)
+            if done.cancelled() or done.exception() is not None or done.result()[1]:
+                self.stats.failed += 1
+            elif self.cache is not None:
+                self.cache.put(key, done.result()[0])
+        future.add_done_callback(finished)
+        return future
+
+    @staticmethod
+    def _error(message):
+        return json.dumps({'error': message}).encode('utf-8')
+
+    @staticmethod
+    def _write_response(writer, status, payload, extra, keep_alive):
+        head = [f"HTTP/1.1 {status.value} {status.phrase}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(payload)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in extra.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+
+
+async def _serve(args):
+    cache = ResultCache(args.cache_size, args.cache_dir, encoded=True) if args.cache_size else None
+    server = ScheduleServer(args.workers or None, args.max_pending, args.strategy, cache=cache)
+    host, port = await server.start(args.host, args.port)
+    print(f"Serving schedules on http://{host}:{port}/schedule", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve schedule generation over a local HTTP/JSON API")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to bind (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-j', '--workers', type=int, default=0, help="worker processes (default: every core)")
+    parser.add_argument('--max-pending', type=int, default=256,
+                        help="distinct generations queued before new requests get 503")
+    parser.add_argument('--strategy', default=DEFAULT_STRATEGY, choices=['greedy', *ALLOCATION_STRATEGIES],
+                        help="allocation strategy when a request does not pick one")
+    parser.add_argument('--cache-size', type=int, default=1024,
+                        help="results kept in memory for repeated profiles; 0 turns caching off")
+    parser.add_argument('--cache-dir', help="also keep cached results in this directory")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import heapq
+import time
+
+from sh_time import PREFERRED_WINDOWS
+
+# Costs are integers: each scheduled minute earns PRIORITY_WEIGHT * priority,
+# and a session outside its preferred window gives back OFF_PREFERENCE_COST.
+# Keeping the penalty below one priority step means preference never beats priority.
+PRIORITY_WEIGHT = 4
+OFF_PREFERENCE_COST = 1
+
+
+class MinCostFlow:
+    """Successive shortest paths min-cost flow with Dijkstra and node potentials"""
+
+    def __init__(self, node_count):
+        self.graph = [[] for _ in range(node_count)]
+
+    def add_edge(self, u, v, capacity, cost):
+        """Add an arc and return its handle for reading the flow later"""
+        self.graph[u].append([v, capacity, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        return (u, len(self.graph[u]) - 1)
+
+    def flow_on(self, handle):
+        u, i = handle
+        v, _, _, rev = self.graph[u][i]
+        return self.graph[v][rev][1]
+
+    def solve(self, source, sink, potentials, deadline=None):
+        """Augment along cheapest paths while they still lower the total cost.
+
+        potentials must make every reduced cost non-negative on the starting
+        graph. Stopping at the deadline leaves a valid, if not optimal, flow.
+        """
+        graph = self.graph
+        n = len(graph)
+        while deadline is None or time.perf_counter() < deadline:
+            dist = [None] * n
+            prev = [None] * n
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                for i, (v, capacity, cost, _) in enumerate(graph[u]):
+                    if capacity <= 0:
+                        continue
+                    nd = d + cost + potentials[u] - potentials[v]
+                    if dist[v] is None or nd < dist[v]:
+                        dist[v] = nd
+                        prev[v] = (u, i)
+                        heapq.heappush(heap, (nd, v))
+            if dist[sink] is None:
+                return
+            # Unreached nodes move by the largest distance so reduced costs stay non-negative
+            furthest = max(d for d in dist if d is not None)
+            for v in range(n):
+                potentials[v] += furthest if dist[v] is None else dist[v]
+            # Real path cost; once it is no longer negative more flow only costs more
+            if potentials[sink] - potentials[source] >= 0:
+                return
+
+            push = None
+            v = sink
+            while v != source:
+                u, i = prev[v]
+                capacity = graph[u][i][1]
+                push = capacity if push is None else min(push, capacity)
+                v = u
+            v = sink
+            while v != source:
+                u, i = prev[v]
+                edge = graph[u][i]
+                edge[1] -= push
+                graph[v][edge[3]][1] += push
+                v = u
+
+
+def _overlaps_window(start, end, preferred_time):
+    window = PREFERRED_WINDOWS.get(preferred_time)
+    if window is None:
+        return True
+    return start < window[1] and end > window[0]
+
+
+def _solve_once(goals, gaps, remaining, banned, deadline):
+    """Build and solve the flow network; return {(goal_index, gap_index): minutes}"""
+    # Nodes: 0 source, 1 sink, then one per goal, then one per gap
+    source, sink = 0, 1
+    goal_base, gap_base = 2, 2 + len(goals)
+    flow = MinCostFlow(gap_base + len(gaps))
+    potentials = [0] * (gap_base + len(gaps))
+
+    arcs = {}
+    for g, goal in enumerate(goals):
+        if remaining[g] <= 0:
+            continue
+        gain = PRIORITY_WEIGHT * goal['priority']
+        flow.add_edge(source, goal_base + g, remaining[g], -gain)
+        potentials[goal_base + g] = -gain
+        min_session = int(goal['min_session'] * 60)
+        max_session = int(goal['max_session'] * 60)
+        for k, (day, start, end) in enumerate(gaps):
+            length = end - start
+            if length < min_session or (g, k) in banned:
+                continue
+            cost = 0 if _overlaps_window(start, end, goal.get('preferred_time')) else OFF_PREFERENCE_COST
+            arcs[(g, k)] = flow.add_edge(goal_base + g, gap_base + k, min(length, max_session), cost)
+
+    for k, (day, start, end) in enumerate(gaps):
+        flow.add_edge(gap_base + k, sink, end - start, 0)
+    # Initial shortest distances; the network is a DAG so they are direct to compute
+    most_negative = min(potentials[goal_base:gap_base], default=0)
+    for k in range(len(gaps)):
+        potentials[gap_base + k] = most_negative
+    potentials[sink] = most_negative
+
+    flow.solve(source, sink, potentials, deadline)
+    return {key: flow.flow_on(handle) for key, handle in arcs.items() if flow.flow_on(handle) > 0}
+
+
+def allocate_optimal(goals, free_slots, already_scheduled, time_budget=1.0):
+    """Allocate learning sessions maximizing priority-weighted scheduled minutes.
+
+    goals are learning_goals dicts, free_slots maps day -> [(start, end)] and
+    already_scheduled maps goal name -> minutes placed elsewhere. Sessions
+    respect max_session, one session per goal per free gap, and prefer gaps
+    overlapping the goal's preferred_time window. The flow relaxation is
+    solved exactly; sessions shorter than min_session are then banned and
+    the network re-solved until none are left or time_budget (seconds) runs
+    out, after which any remaining short sessions are dropped.
+
+    Returns a list of (day, goal, start, end) tuples.
+    """
+    deadline = time.perf_counter() + time_budget
+    gaps = [(day, int(start), int(end)) for day, slots in free_slots.items()
+            for start, end in slots if int(end) > int(start)]
+    remaining = [max(0, int(round(goal['weekly_hours'] * 60)) - int(already_scheduled.get(goal['name'], 0)))
+                 for goal in goals]
+
+    banned = set()
+    while True:
+        assigned = _solve_once(goals, gaps, remaining, banned, deadline)
+        too_short = {key for key, minutes in assigned.items()
+                     if minutes < int(goals[key[0]]['min_session'] * 60)}
+        if not too_short or time.perf_counter() >= deadline:
+            break
+        banned |= too_short
+
+    # Lay sessions out back to back inside each gap, earliest preferred window first
+    window_order = {'morning': 0, 'anytime': 1, 'afternoon': 2, 'evening': 3}
+    by_gap = {}
+    for (g, k), minutes in assigned.items():
+        if (g, k) not in too_short:
+            by_gap.setdefault(k, []).append((window_order.get(goals[g].get('preferred_time'), 1), g, minutes))
+
+    sessions = []
+    for k in sorted(by_gap):
+        day, cursor, _ = gaps[k]
+        for _, g, minutes in sorted(by_gap[k]):
+            sessions.append((day, goals[g], cursor, cursor + minutes))
+            cursor += minutes
+    return sessions
+
+
+def _fair_placement(segments, goal, min_session, length, edges):
+    """(segment index, start, end) of the best session for goal among a day's free segments, or None.
+
+    Prefers the longest stretch inside the preferred_time window, then the
+    earliest segment that fits. A session never touches one of the goal's
+    own sessions that day (edges holds their starts and ends), which would
+    merge the two into one longer than max_session.
+    """
+    window = PREFERRED_WINDOWS.get(goal.get('preferred_time'))
+    candidates = []
+    if window is not None:
+        stretches = [(i, max(start, window[0]), min(end, window[1])) for i, (start, end) in enumerate(segments)]
+        candidates.append(sorted(stretches, key=lambda stretch: stretch[1] - stretch[2]))
+    candidates.append([(i, start, end) for i, (start, end) in enumerate(segments)])
+    for stretches in candidates:
+        for i, start, end in stretches:
+            if end - start < min_session:
+                continue
+            end = start + min(end - start, length)
+            if start not in edges and end not in edges:
+                return i, start, end
+    return None
+
+
+def allocate_fair(goals, free_slots, already_scheduled, time_budget=None):
+    """Allocate learning sessions by fair share, interleaving goals across the week.
+
+    Goals wait in a heap keyed by remaining minutes x priority; the goal
+    with the largest weighted deficit places its next session, then goes
+    back with a smaller key. Each session goes on the day where that goal
+    has the least time so far (ties to the least loaded day), in its
+    preferred_time window when possible, and lasts at most max_session. A
+    goal may get several sessions on one day. With S sessions this is
+    O(S log S) heap work, plus a pass over the week's free segments per
+    session. time_budget is accepted for the allocator interface and unused.
+
+    Returns a list of (day, goal, start, end) tuples, in day and start order.
+    """
+    days = list(free_slots)
+    # Free segments per day, shrinking as sessions are placed
+    segments = {day: [(int(start), int(end)) for start, end in free_slots[day] if int(end) > int(start)]
+                for day in days}
+    load = {day: 0 for day in days}
+
+    # Ties go to the higher priority, then by name, so the result does not depend on goal order
+    heap = []
+    for g, goal in enumerate(goals):
+        remaining = int(round(goal['weekly_hours'] * 60)) - int(already_scheduled.get(goal['name'], 0))
+        if remaining > 0:
+            heap.append((-remaining * goal['priority'], -goal['priority'], goal['name'], g, remaining))
+    heapq.heapify(heap)
+
+    placed = {g: {day: 0 for day in days} for g in range(len(goals))}
+    # (goal index, day) -> starts and ends of that goal's sessions on that day
+    session_edges = {}
+    sessions = []
+    while heap:
+        _, _, _, g, remaining = heapq.heappop(heap)
+        goal = goals[g]
+        min_session = max(int(goal['min_session'] * 60), 1)
+        length = min(int(goal['max_session'] * 60), remaining)
+        if length < min_session:
+            continue
+        for day in sorted(days, key=lambda day: (placed[g][day], load[day])):
+            edges = session_edges.setdefault((g, day), set())
+            placement = _fair_placement(segments[day], goal, min_session, length, edges)
+            if placement is not None:
+                break
+        else:
+            # Nothing left on any day fits min_session
+            continue
+
+        i, start, end = placement
+        segment_start, segment_end = segments[day][i]
+        segments[day][i:i + 1] = [(a, b) for a, b in ((segment_start, start), (end, segment_end)) if b > a]
+        edges.update((start, end))
+        placed[g][day] += end - start
+        load[day] += end - start
+        sessions.append((day, goal, start, end))
+        remaining -= end - start
+        if remaining > 0:
+            heapq.heappush(heap, (-remaining * goal['priority'], -goal['priority'], goal['name'], g, remaining))
+
+    order = {day: position for position, day in enumerate(days)}
+    sessions.sort(key=lambda session: (order[session[0]], session[2]))
+    return sessions
@@ -0,0 +1,94 @@
+from functools import lru_cache
+
+MINUTES_PER_DAY = 24 * 60
+
+# Time-of-day windows used by a learning goal's preferred_time, in minutes since midnight
+PREFERRED_WINDOWS = {
+    'morning': (5 * 60, 12 * 60),
+    'afternoon': (12 * 60, 17 * 60),
+    'evening': (17 * 60, 24 * 60),
+}
+
+# Every minute of the day pre-formatted, and the reverse lookup for canonical "HH:MM" strings
+_FORMATTED = [f"{minutes // 60:02d}:{minutes % 60:02d}" for minutes in range(MINUTES_PER_DAY)]
+_CANONICAL = {text: minutes for minutes, text in enumerate(_FORMATTED)}
+
+# Distinct non-canonical spellings ("7", "7:30", " 16:00") a process is likely to see
+CACHE_SIZE = 4096
+
+
+def format_time(minutes):
+    """Convert minutes since midnight to HH:MM"""
+    minutes = int(minutes)  # Ensure we have an integer
+    if 0 <= minutes < MINUTES_PER_DAY:
+        return _FORMATTED[minutes]
+    # Out-of-day values (prep before midnight, recovery after it) keep the plain arithmetic
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_clock(minutes):
+    """Wall-clock HH:MM for a minute offset that may run before or past midnight"""
+    return _FORMATTED[int(minutes) % MINUTES_PER_DAY]
+
+
+def parse_time(time_str):
+    """Convert time string to minutes since midnight"""
+    minutes = _CANONICAL.get(time_str)
+    if minutes is not None:
+        return minutes
+    return _parse_time(time_str)
+
+
+def _clock_fields(time_str):
+    """Hours and minutes of a stripped "HH:MM", "H:MM", "HH" or "H" string, not yet range-checked"""
+    if ':' in time_str:
+        parts = time_str.split(':')
+        if len(parts) != 2:
+            raise ValueError(f"Invalid time format: {time_str}")
+        return int(parts[0]), int(parts[1])
+    # Format: just hour (e.g., "7" or "07")
+    return int(time_str), 0
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_time(time_str):
+    time_str = time_str.strip()
+    hours, minutes = _clock_fields(time_str)
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+        raise ValueError(f"Invalid time: {time_str}")
+    return hours * 60 + minutes
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def validate_time_format(time_str):
+    """Validate time format and return standardized format"""
+    if not time_str or time_str.strip() == "":
+        raise ValueError("Time cannot be empty")
+
+    time_str = time_str.strip()
+    try:
+        hours, minutes = _clock_fields(time_str)
+    except ValueError:
+        if ':' not in time_str:
+            raise ValueError(f"Invalid time format: {time_str}. Use HH:MM, H:MM, or just H") from None
+        if time_str.count(':') != 1:
+            raise ValueError(f"Invalid time format: {time_str}. Use HH:MM or H:MM") from None
+        raise ValueError(f"Invalid time format: {time_str}. Hours and minutes must be numbers") from None
+    if not (0 <= hours <= 23):
+        raise ValueError(f"Invalid hour: {hours}. Must be between 0-23")
+    if not (0 <= minutes <= 59):
+        raise ValueError(f"Invalid minutes: {minutes}. Must be between 0-59")
+
+    return _FORMATTED[hours * 60 + minutes]
+
+
+def clock_to_minutes(text):
+    """Minutes for an "HH:MM" string as written by format_time, including out-of-day values
+    ("-1:30", "25:00"), or for a raw user time such as "7" that older files kept as typed"""
+    minutes = _CANONICAL.get(text)
+    if minutes is not None:
+        return minutes
+    hours, sep, minutes = text.partition(':')
+    if not sep or ':' in minutes:
+        return parse_time(text)
+    return int(hours) * 60 + int(minutes)
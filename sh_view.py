@@ -0,0 +1,211 @@
+import tkinter
+import tkinter.font as tkfont
+from bisect import bisect_right
+
+from sh_time import format_clock
+
+RULE = '=' * 50
+
+# Text colour per entry type; headers and summary lines use the default
+TYPE_COLORS = {
+    'fixed': '#DCE4EE',
+    'learning': '#7BC67B',
+    'break': '#E5C07B',
+    'entertainment': '#61AFEF',
+}
+TEXT_COLOR = '#DCE4EE'
+HEADER_COLOR = '#FFFFFF'
+BACKGROUND = '#1D1E1E'
+
+
+def entry_rows(entries):
+    """(start, end, entry) rows of one day's entries, sorted by start time"""
+    return sorted(((item.start_min, item.end_min, item) for item in entries), key=lambda row: row[0])
+
+
+def day_lines(day, rows):
+    """(text, kind) lines for one day's (start, end, entry) rows, already in start order"""
+    lines = [('', None), (RULE, 'header'), (f"{day.upper():^50}", 'header'), (RULE, 'header')]
+    if not rows:
+        lines.append(("No activities scheduled.", None))
+    for start, end, item in rows:
+        lines.append((f"{format_clock(start):>5} - {format_clock(end):<5} │ {item.task}", item.type))
+    return lines
+
+
+def summary_lines(scheduler, days):
+    """Weekly summary and learning-goal progress lines"""
+    user_data = scheduler.user_data
+    scheduled = {goal['name']: 0 for goal in user_data['learning_goals']}
+    for _, rows in days:
+        for _, _, item in rows:
+            if item.type == 'learning' and item.task in scheduled:
+                scheduled[item.task] += (item.end_min - item.start_min) / 60
+
+    lines = [('', None), ('', None), (RULE, 'header'), (f"{'WEEKLY SUMMARY':^50}", 'header'), (RULE, 'header'),
+             (f"Sleep: {user_data['sleep_duration']} hours/night", None),
+             (f"Entertainment: {user_data['entertainment_hours']} hours/week", None)]
+    if user_data['cook_dinner']:
+        lines.append((f"Cooking: {user_data['cooking_time']} hours/day", None))
+    lines += [('', None), ("LEARNING GOALS PROGRESS:", None), ('-' * 30, None)]
+    for goal in user_data['learning_goals']:
+        target = goal['weekly_hours']
+        done = scheduled.get(goal['name'], 0)
+        percentage = (done / target * 100) if target > 0 else 0
+        lines.append((f"{goal['name']}: {done:.1f}h / {target:.1f}h ({percentage:.0f}%)", None))
+    return lines
+
+
+def schedule_days(scheduler):
+    """(day, rows) for each day of the week, with items crossing midnight shown once, on the day they start"""
+    timeline = scheduler.timeline()
+    return [(day, timeline.day(day)) for day in scheduler.days]
+
+
+def schedule_text(scheduler):
+    """The whole schedule as plain text, as shown in the schedule window"""
+    days = schedule_days(scheduler)
+    lines = [line for day, rows in days for line in day_lines(day, rows)]
+    lines += summary_lines(scheduler, days)
+    return ''.join(text + '\n' for text, _ in lines)
+
+
+def _signature(rows):
+    return tuple((start, end, item.task, item.type) for start, end, item in rows)
+
+
+class ScheduleLayout:
+    """Lines of a schedule grouped in blocks (one per day, then the summary).
+
+    Each day's lines are cached against the entries they came from, so an
+    update only re-lays out the days that changed. Line n is found with a
+    bisect over the block offsets.
+    """
+
+    def __init__(self):
+        # label -> (entry signature, lines)
+        self._cache = {}
+        self.blocks = []
+        # offsets[i] is the index of the first line of blocks[i]
+        self.offsets = []
+        self.line_count = 0
+        # Bumped whenever the lines change, so views know to redraw
+        self.version = 0
+
+    def update(self, days, summary):
+        """Lay out (label, rows) days and the summary lines; returns the labels re-laid out"""
+        changed = []
+        blocks = []
+        for label, rows in days:
+            signature = _signature(rows)
+            cached = self._cache.get(label)
+            if cached is None or cached[0] != signature:
+                cached = (signature, day_lines(label, rows))
+                self._cache[label] = cached
+                changed.append(label)
+            blocks.append(cached[1])
+        labels = {label for label, _ in days}
+        for label in [label for label in self._cache if label not in labels]:
+            del self._cache[label]
+        blocks.append(summary)
+
+        if changed or summary != (self.blocks[-1] if self.blocks else None) or len(blocks) != len(self.blocks):
+            self.blocks = blocks
+            self.offsets = []
+            total = 0
+            for block in blocks:
+                self.offsets.append(total)
+                total += len(block)
+            self.line_count = total
+            self.version += 1
+        return changed
+
+    def lines(self, first, last):
+        """Yield (line index, text, kind) for lines first..last-1"""
+        first = max(first, 0)
+        last = min(last, self.line_count)
+        if first >= last:
+            return
+        block = bisect_right(self.offsets, first) - 1
+        index = first
+        while index < last:
+            lines = self.blocks[block]
+            for text, kind in lines[index - self.offsets[block]:last - self.offsets[block]]:
+                yield index, text, kind
+                index += 1
+            block += 1
+
+
+class ScheduleView(tkinter.Frame):
+    """Scrollable schedule drawn on a canvas, creating text items only for the visible lines"""
+
+    def __init__(self, master, font=("Courier New", 12), **kwargs):
+        super().__init__(master, background=BACKGROUND, **kwargs)
+        self.font = tkfont.Font(family=font[0], size=font[1])
+        self.bold_font = tkfont.Font(family=font[0], size=font[1], weight='bold')
+        self.row_height = self.font.metrics('linespace') + 2
+        self.layout = ScheduleLayout()
+
+        self.canvas = tkinter.Canvas(self, background=BACKGROUND, highlightthickness=0,
+                                     yscrollincrement=self.row_height)
+        self.scrollbar = tkinter.Scrollbar(self, orient='vertical', command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        # Canvas text items reused from one redraw to the next
+        self._items = []
+        self._drawn = None
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.canvas.bind(sequence, self._on_wheel)
+
+    def show(self, scheduler):
+        """Display a scheduler's schedule; only days that changed since the last call are re-laid out"""
+        days = schedule_days(scheduler)
+        self._show(days, summary_lines(scheduler, days))
+
+    def show_days(self, days, summary=()):
+        """Display any sequence of (label, entries) with string labels, e.g. the dates of a DateRangeSchedule"""
+        self._show([(label, entry_rows(entries)) for label, entries in days], summary)
+
+    def _show(self, days, summary):
+        self.layout.update(days, list(summary))
+        height = self.layout.line_count * self.row_height + self.row_height
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height))
+        self.redraw()
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def _on_wheel(self, event):
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self.canvas.yview_scroll(-3, 'units')
+        else:
+            self.canvas.yview_scroll(3, 'units')
+        self.redraw()
+
+    def redraw(self):
+        """Draw the lines in view, skipping the work when neither the view nor the lines moved"""
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), 1)
+        first = int(top // self.row_height)
+        last = int((top + height) // self.row_height) + 1
+        if self._drawn == (first, last, self.layout.version):
+            return
+        self._drawn = (first, last, self.layout.version)
+
+        used = 0
+        for index, text, kind in self.layout.lines(first, last):
+            if used == len(self._items):
+                self._items.append(self.canvas.create_text(0, 0, anchor='nw'))
+            item = self._items[used]
+            used += 1
+            self.canvas.coords(item, 10, index * self.row_height)
+            self.canvas.itemconfigure(
+                item, text=text, state='normal',
+                font=self.bold_font if kind == 'header' else self.font,
+                fill=HEADER_COLOR if kind == 'header' else TYPE_COLORS.get(kind, TEXT_COLOR))
+        for item in self._items[used:]:
+            self.canvas.itemconfigure(item, state='hidden')
@@ -0,0 +1,21 @@
+"""Random profiles shared by the randomized tests"""
+from sh_bench import DAYS
+from sh_time import MINUTES_PER_DAY, format_time
+
+# The stages the GUI runs, routines before learning
+GUI_PIPELINE = ('add_fixed_commitments', 'add_routine_tasks', 'schedule_learning_goals', 'schedule_entertainment')
+
+
+def midnight_class(rng, i):
+    """A class that may start just before or just after midnight, with prep and recovery around it"""
+    start = rng.choice([rng.randrange(0, MINUTES_PER_DAY, 15), 23 * 60 + 30, 0, 30])
+    end = min(start + rng.randrange(30, 180, 15), MINUTES_PER_DAY - 1)
+    return {'name': f"Night {i}", 'days': rng.sample(DAYS, rng.randint(1, 3)),
+            'start_time': format_time(start), 'end_time': format_time(end),
+            'prep_time': rng.choice([0, 0.5, 1]), 'post_time': rng.choice([0, 0.5, 1])}
+
+
+def rows(schedule):
+    """Each day's entries as sorted (task, start, end, type) tuples, ignoring insertion order"""
+    return {day: sorted((item.task, item.start_min, item.end_min, item.type) for item in items)
+            for day, items in schedule.items()}
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from sh_bench import DAYS, synthetic_profile
+from sh_gen import FreeSlotIndex, ScheduleGenerator
+from sh_time import MINUTES_PER_DAY
+
+from profiles import midnight_class
+
+
+def sweep(day_start, day_end, intervals):
+    """Free slots the way the original get_available_slots found them: one pass over sorted busy time"""
+    slots = []
+    current = day_start
+    for start, end in sorted(intervals, key=lambda interval: interval[0]):
+        if current < start:
+            slots.append((current, start))
+        current = max(current, end)
+    if current < day_end:
+        slots.append((current, day_end))
+    return slots
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_index_matches_sweep(seed):
+    rng = random.Random(seed)
+    day_start = rng.choice([0, 300, 420])
+    day_end = day_start + rng.choice([600, 900, 1020])
+    index = FreeSlotIndex(day_start, day_end)
+    reserved = []
+    for _ in range(rng.randint(1, 25)):
+        start = rng.randrange(day_start, day_end + 1)
+        # Zero-length items split the slot they fall in, as they did in the sweep
+        end = min(start + rng.choice([0, 0, 15, 60, 240]), day_end)
+        index.reserve(start, end)
+        reserved.append((start, end))
+        assert index.slots() == sweep(day_start, day_end, reserved)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_available_slots_match_sweep(seed):
+    rng = random.Random(seed)
+    user_data = synthetic_profile(seed, n_classes=rng.randint(0, 12))
+    user_data['fixed_classes'] += [midnight_class(rng, i) for i in range(rng.randint(0, 3))]
+    if rng.random() < 0.5:
+        # A late riser whose waking window runs past midnight into the next day's commitments
+        user_data['wake_up_time'], user_data['sleep_duration'] = rng.choice(['10:00', '11:30']), 7
+    scheduler = ScheduleGenerator()
+    scheduler.load_user_data(user_data)
+    scheduler.run_pipeline()
+
+    day_start = scheduler.time_to_minutes(user_data['wake_up_time'])
+    day_end = day_start + MINUTES_PER_DAY - user_data['sleep_duration'] * 60
+    for position, day in enumerate(DAYS):
+        busy = [(item.start_min, item.end_min) for item in scheduler.schedule[day] if item.type == 'fixed']
+        # Fixed time spilling over midnight from either neighbour
+        busy += [(item.start_min - MINUTES_PER_DAY, item.end_min - MINUTES_PER_DAY)
+                 for item in scheduler.schedule[DAYS[position - 1]]
+                 if item.type == 'fixed' and item.end_min > MINUTES_PER_DAY]
+        busy += [(item.start_min + MINUTES_PER_DAY, item.end_min + MINUTES_PER_DAY)
+                 for item in scheduler.schedule[DAYS[(position + 1) % 7]]
+                 if item.type == 'fixed' and item.start_min + MINUTES_PER_DAY < day_end]
+        clipped = [(max(start, day_start), min(end, day_end)) for start, end in busy
+                   if end >= day_start and start <= day_end]
+        assert scheduler.get_available_slots(day) == sweep(day_start, day_end, clipped)
@@ -0,0 +1,87 @@
+import copy
+import random
+
+import pytest
+
+from sh_bench import synthetic_profile
+from sh_gen import ScheduleGenerator
+
+from profiles import GUI_PIPELINE, midnight_class, rows
+
+# Seeds per strategy; the optimal solver is slower, so it gets fewer
+CASES = [(strategy, seed) for strategy, seeds in (('greedy', 100), ('fair', 100), ('optimal', 20))
+         for seed in range(seeds)]
+
+
+def random_profile(rng, seed):
+    user_data = synthetic_profile(seed, n_classes=rng.randint(0, 8), n_goals=rng.randint(1, 6))
+    user_data['fixed_classes'] += [midnight_class(rng, i) for i in range(rng.randint(0, 2))]
+    if rng.random() < 0.5:
+        # Waking hours running past midnight see the next day's early classes
+        user_data['wake_up_time'], user_data['sleep_duration'] = rng.choice(['09:30', '10:00', '11:00']), 7
+    return user_data
+
+
+def rebuilt(scheduler, stages):
+    """A scheduler generated from scratch for scheduler's current user_data"""
+    fresh = ScheduleGenerator(scheduler.strategy)
+    fresh.load_user_data(copy.deepcopy(scheduler.user_data))
+    fresh.run_pipeline(stages)
+    return fresh
+
+
+def slots(scheduler):
+    return {day: scheduler.get_available_slots(day) for day in scheduler.days}
+
+
+@pytest.mark.parametrize('strategy, seed', CASES)
+def test_apply_user_data_matches_rebuild(strategy, seed):
+    rng = random.Random(seed)
+    stages = GUI_PIPELINE if seed % 2 else None
+    old, other = random_profile(rng, seed), random_profile(rng, seed + 1000)
+    new = copy.deepcopy(old)
+    if rng.random() < 0.5:
+        new['fixed_classes'] = other['fixed_classes']
+    else:
+        new['fixed_classes'] = new['fixed_classes'][:rng.randint(0, len(new['fixed_classes']))] + other['fixed_classes'][:1]
+    if rng.random() < 0.5:
+        new['learning_goals'] = other['learning_goals']
+    elif new['learning_goals']:
+        goal = rng.choice(new['learning_goals'])
+        goal['weekly_hours'], goal['priority'] = rng.choice([1, 3, 12]), rng.randint(1, 10)
+    if rng.random() < 0.2:
+        new['wake_up_time'] = other['wake_up_time']
+
+    scheduler = ScheduleGenerator(strategy)
+    scheduler.load_user_data(old)
+    scheduler.run_pipeline(stages)
+    scheduler.apply_user_data(new)
+    assert rows(scheduler.schedule) == rows(rebuilt(scheduler, stages).schedule)
+
+
+@pytest.mark.parametrize('strategy, seed', CASES)
+def test_updates_match_rebuild(strategy, seed):
+    rng = random.Random(seed)
+    stages = GUI_PIPELINE if seed % 2 else None
+    scheduler = ScheduleGenerator(strategy)
+    scheduler.load_user_data(random_profile(rng, seed))
+    scheduler.run_pipeline(stages)
+    for step in range(5):
+        goals = scheduler.user_data['learning_goals']
+        if rng.random() < 0.4:
+            count = len(scheduler.user_data['fixed_classes'])
+            index = rng.randrange(count + 1)
+            removed = index < count and rng.random() < 0.3
+            scheduler.update_fixed_class(index, None if removed else midnight_class(rng, 100 + step))
+        elif goals and rng.random() < 0.6:
+            goal = rng.choice(goals)
+            changed = dict(goal, weekly_hours=rng.choice([1, 3, 6, 12]), priority=rng.randint(1, 10))
+            scheduler.update_learning_goal(goal['name'], None if rng.random() < 0.3 else changed)
+        else:
+            scheduler.update_learning_goal(f"New {step}", {
+                'name': f"New {step}", 'weekly_hours': 3, 'priority': rng.randint(1, 10),
+                'min_session': 0.5, 'max_session': 1.5,
+                'preferred_time': rng.choice(['morning', 'evening', 'anytime'])})
+        fresh = rebuilt(scheduler, stages)
+        assert rows(scheduler.schedule) == rows(fresh.schedule), f"step {step}"
+        assert slots(scheduler) == slots(fresh), f"step {step}"
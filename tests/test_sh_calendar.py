@@ -0,0 +1,19 @@
+import pytest
+
+from sh_bench import synthetic_profile
+from sh_calendar import DateRangeSchedule
+
+
+def test_added_class_defaults_prep_and_post_time():
+    exceptions = [{'date': '2026-01-14', 'add': [{'name': 'Dentist', 'start_time': '15:00', 'end_time': '16:00'}]}]
+    calendar = DateRangeSchedule(synthetic_profile(1), '2026-01-05', '2026-01-25', exceptions).generate()
+    tasks = [item.task for item in calendar.entries_for('2026-01-14')]
+    assert 'Dentist' in tasks
+    assert not any(task.startswith('Dentist - ') for task in tasks)
+    assert 'Dentist' not in [item.task for item in calendar.entries_for('2026-01-21')]
+
+
+def test_added_class_without_times_is_rejected():
+    exceptions = [{'date': '2026-01-14', 'add': [{'name': 'Dentist', 'start_time': '15:00'}]}]
+    with pytest.raises(ValueError, match='missing end_time'):
+        DateRangeSchedule(synthetic_profile(1), '2026-01-05', '2026-01-25', exceptions)
@@ -0,0 +1,87 @@
+import os
+import random
+
+import pytest
+
+import sh_io
+from sh_bench import synthetic_profile
+from sh_gen import ScheduleGenerator
+from sh_time import clock_to_minutes
+
+from profiles import GUI_PIPELINE, midnight_class
+
+# Written by the original save_schedule, which kept times as the user typed them ('7', '4:30')
+ORIGINAL = os.path.join(os.path.dirname(__file__), 'fixtures', 'original_schedule.yaml')
+
+
+def rows(schedule):
+    return {day: [(item.task, item.start_min, item.end_min, item.type) for item in items]
+            for day, items in schedule.items()}
+
+
+@pytest.mark.parametrize('text, minutes', [
+    ('07:30', 450), ('7', 420), ('4:30', 270), (' 16 ', 960), ('-1:30', -30), ('25:00', 1500),
+])
+def test_clock_to_minutes(text, minutes):
+    assert clock_to_minutes(text) == minutes
+
+
+def test_load_original_format():
+    scheduler = sh_io.load(ORIGINAL)
+    tuesday = rows(scheduler.schedule)['Tuesday']
+    assert ('Sleep', 0, 7 * 60, 'fixed') in tuesday
+    assert ('Gym', 4 * 60 + 30, 6 * 60, 'fixed') in tuesday
+    assert ('Gym - Recovery', 6 * 60, 6 * 60 + 30, 'fixed') in tuesday
+    assert scheduler.user_data['wake_up_time'] == '7'
+
+
+def test_open_original_format_matches_load():
+    expected = rows(sh_io.load(ORIGINAL).schedule)
+    scheduler = sh_io.open_schedule(ORIGINAL)
+    try:
+        assert rows(scheduler.schedule) == expected
+    finally:
+        getattr(scheduler.schedule, 'close', lambda: None)()
+
+
+@pytest.mark.parametrize('fmt', list(sh_io.FORMATS))
+def test_round_trip_original_format(tmp_path, fmt):
+    scheduler = sh_io.load(ORIGINAL)
+    filename = str(tmp_path / f"schedule{sh_io.FORMATS[fmt][0]}")
+    sh_io.save(scheduler, filename, fmt)
+    assert rows(sh_io.load(filename).schedule) == rows(scheduler.schedule)
+    reopened = sh_io.open_schedule(filename)
+    try:
+        assert rows(reopened.schedule) == rows(scheduler.schedule)
+        assert reopened.user_data == scheduler.user_data
+    finally:
+        getattr(reopened.schedule, 'close', lambda: None)()
+
+
+@pytest.mark.parametrize('fmt', list(sh_io.FORMATS))
+@pytest.mark.parametrize('seed', range(10))
+def test_round_trip_generated(tmp_path, fmt, seed):
+    rng = random.Random(seed)
+    user_data = synthetic_profile(seed, n_classes=rng.randint(0, 10))
+    # Prep before 00:00 and recovery after 24:00 are stored as out-of-day minutes
+    user_data['fixed_classes'] += [midnight_class(rng, i) for i in range(rng.randint(1, 3))]
+    scheduler = ScheduleGenerator(rng.choice(['greedy', 'fair', 'optimal']))
+    scheduler.load_user_data(user_data)
+    scheduler.run_pipeline(GUI_PIPELINE if seed % 2 else None)
+
+    filename = str(tmp_path / f"schedule{sh_io.FORMATS[fmt][0]}")
+    sh_io.save(scheduler, filename, fmt)
+    loaded = sh_io.load(filename)
+    assert rows(loaded.schedule) == rows(scheduler.schedule)
+    assert loaded.user_data == scheduler.user_data
+    goals = {goal['name']: goal for goal in loaded.user_data['learning_goals']}
+    for items in loaded.schedule.values():
+        for item in items:
+            if item.type == 'learning':
+                assert item.source is goals[item.task]
+
+    reopened = sh_io.open_schedule(filename)
+    try:
+        assert rows(reopened.schedule) == rows(scheduler.schedule)
+    finally:
+        getattr(reopened.schedule, 'close', lambda: None)()
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+import sh_solver
+from sh_bench import synthetic_profile
+from sh_gen import ScheduleGenerator
+
+ALLOCATORS = {'fair': sh_solver.allocate_fair, 'optimal': sh_solver.allocate_optimal}
+
+
+def free_slots(user_data):
+    scheduler = ScheduleGenerator()
+    scheduler.load_user_data(user_data)
+    scheduler.add_fixed_commitments()
+    return {day: scheduler.get_available_slots(day) for day in scheduler.days}
+
+
+def goal(name, weekly_hours, priority, preferred_time='anytime', min_session=0.5, max_session=1):
+    return {'name': name, 'weekly_hours': weekly_hours, 'priority': priority,
+            'preferred_time': preferred_time, 'min_session': min_session, 'max_session': max_session}
+
+
+@pytest.mark.parametrize('strategy', list(ALLOCATORS))
+@pytest.mark.parametrize('seed', range(60))
+def test_sessions_fit(strategy, seed):
+    rng = random.Random(seed)
+    user_data = synthetic_profile(seed, n_classes=rng.randint(0, 12), n_goals=rng.randint(1, 8),
+                                  min_session=rng.choice([0.25, 0.5, 1]), max_session=rng.choice([1, 1.5, 2]))
+    goals = user_data['learning_goals']
+    slots = free_slots(user_data)
+    already = {item['name']: rng.choice([0, 0, 30, 120]) for item in goals}
+    sessions = ALLOCATORS[strategy](goals, slots, already, 5)
+
+    totals = dict.fromkeys(already, 0)
+    per_day = {}
+    for day, item, start, end in sessions:
+        assert int(item['min_session'] * 60) <= end - start <= int(item['max_session'] * 60)
+        # Inside one free slot, and clear of every other session that day
+        assert any(slot_start <= start and end <= slot_end for slot_start, slot_end in slots[day])
+        per_day.setdefault(day, []).append((start, end, item['name']))
+        totals[item['name']] += end - start
+    for item in goals:
+        assert totals[item['name']] <= max(0, round(item['weekly_hours'] * 60) - already[item['name']])
+    for day, placed in per_day.items():
+        placed.sort()
+        for (_, first_end, first), (second_start, _, second) in zip(placed, placed[1:]):
+            assert first_end <= second_start
+            # Touching sessions of one goal would read as a single one longer than max_session
+            assert first_end < second_start or first != second
+
+
+def test_optimal_prefers_priority_over_window():
+    slots = {'Monday': [(9 * 60, 10 * 60), (19 * 60, 20 * 60)]}
+    goals = [goal('Evening', 1, 1, 'evening'), goal('Math', 2, 10, 'morning')]
+    sessions = sh_solver.allocate_optimal(goals, slots, {})
+    assert sorted((item['name'], start, end) for _, item, start, end in sessions) == [
+        ('Math', 9 * 60, 10 * 60), ('Math', 19 * 60, 20 * 60)]
+
+
+def test_optimal_drops_sessions_below_min_session():
+    slots = {'Monday': [(9 * 60, 9 * 60 + 20)], 'Tuesday': [(9 * 60, 11 * 60)]}
+    sessions = sh_solver.allocate_optimal([goal('Math', 3, 5, max_session=2)], slots, {})
+    assert [(day, start, end) for day, _, start, end in sessions] == [('Tuesday', 9 * 60, 11 * 60)]
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from sh_bench import synthetic_profile
+from sh_gen import ScheduleGenerator
+
+from profiles import midnight_class
+
+
+def overlapping(timeline):
+    """Every overlapping pair by comparing all rows, shifting by a week for pairs across Sunday night"""
+    rows = [row for row in timeline if row[1] > row[0]]
+    pairs = set()
+    for i, (first_start, first_end, first) in enumerate(rows):
+        for second_start, second_end, second in rows[i + 1:]:
+            if any(first_start < second_end + shift and second_start + shift < first_end
+                   for shift in (-timeline.length, 0, timeline.length)):
+                pairs.add(frozenset((id(first), id(second))))
+    return pairs
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_conflicts_match_pairwise(seed):
+    rng = random.Random(seed)
+    user_data = synthetic_profile(seed, n_classes=rng.randint(0, 15))
+    user_data['fixed_classes'] += [midnight_class(rng, i) for i in range(rng.randint(0, 4))]
+    scheduler = ScheduleGenerator()
+    scheduler.load_user_data(user_data)
+    scheduler.add_fixed_commitments()
+
+    timeline = scheduler.timeline(('fixed',))
+    conflicts = timeline.conflicts()
+    assert {frozenset((id(conflict.first), id(conflict.second))) for conflict in conflicts} == overlapping(timeline)
+    assert len(conflicts) == len(overlapping(timeline))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_sleep_joined_across_midnight(seed):
+    scheduler = ScheduleGenerator()
+    scheduler.load_user_data(synthetic_profile(seed))
+    scheduler.add_fixed_commitments()
+    timeline = scheduler.timeline(('fixed',))
+    sleep = [(start, end) for start, end, item in timeline if item.task == 'Sleep']
+    # One night per day, each as long as sleep_duration and ending on a wake-up
+    assert len(sleep) == 7
+    assert all(end - start == scheduler.user_data['sleep_duration'] * 60 for start, end in sleep)
+    wake = scheduler.time_to_minutes(scheduler.user_data['wake_up_time'])
+    assert all(end % (24 * 60) == wake for _, end in sleep)